@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+"""Per-operation time and per-instance memory of CFraction.
+
+Run with: python3 benchmarks/bench_cfraction.py
+Run it on two checkouts to compare an implementation change before and after.
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mathvis"))
+
+from cfractions import CFraction
+
+def best_of(stmt, repeat=5):
+    timer = timeit.Timer(stmt)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def instance_memory(count=10000):
+    """Average bytes allocated per CFraction (including its components)"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    instances = [CFraction((i, 7), (3, i + 1)) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return (allocated - sys.getsizeof(instances)) / count
+
+def main():
+    a = CFraction((3, 7), (-5, 11))
+    b = CFraction((2, 9), (4, 13))
+    cases = [
+        ("CFraction(int, int)", lambda: CFraction(3, 4)),
+        ("CFraction(tuple, tuple)", lambda: CFraction((3, 7), (-5, 11))),
+        ("a + b", lambda: a + b),
+        ("a - b", lambda: a - b),
+        ("a * b", lambda: a * b),
+        ("a / b", lambda: a / b),
+        ("-a", lambda: -a),
+        ("a.conjugate()", lambda: a.conjugate()),
+        ("a ** 5", lambda: a ** 5),
+        ("a + 1", lambda: a + 1),
+    ]
+
+    print("%-26s %10s" % ("operation", "time"))
+    for name, stmt in cases:
+        print("%-26s %8.2fus" % (name, best_of(stmt) * 1e6))
+    print()
+    print("sys.getsizeof(CFraction):  %d bytes" % sys.getsizeof(a))
+    print("has __dict__:              %s" % hasattr(a, "__dict__"))
+    print("allocated per instance:    %.0f bytes" % instance_memory())
+
+if __name__ == "__main__":
+    main()
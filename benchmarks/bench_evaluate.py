@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+"""Compare Horner evaluation of Polynomial against the original power-sum implementation.
+
+Run with: python3 benchmarks/bench_evaluate.py [--points N] [--degree D]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mathvis"))
+
+import numpy
+from polynomials import Polynomial
+
+def legacy_evaluate(polynomial, x):
+    """Polynomial.evaluate as it was before the Horner engine"""
+    return sum(polynomial.coefficients[polynomial.degree-i]*x**i for i in range(polynomial.degree, -1, -1))
+
+def best_of(stmt, repeat=3):
+    timer = timeit.Timer(stmt)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Polynomial.evaluate")
+    parser.add_argument("--points", "-n", type=int, default=20000, help="Number of sample points in the array case")
+    parser.add_argument("--degree", "-d", type=int, default=8, help="Degree of the benchmarked polynomial")
+    args = parser.parse_args()
+
+    f = Polynomial(*[Fraction(i + 1, i + 2) * (-1)**i for i in range(args.degree + 1)])
+    x = numpy.linspace(-10, 10, args.points)
+    scalar = Fraction(7, 3)
+    exact_points = [Fraction(i, 7) for i in range(-100, 100)]
+
+    assert numpy.allclose(f.evaluate(x), legacy_evaluate(f, x).astype(float))
+    assert f.evaluate(scalar) == legacy_evaluate(f, scalar)
+
+    cases = [
+        ("ndarray[%d] float64" % args.points, lambda: legacy_evaluate(f, x), lambda: f.evaluate(x)),
+        ("Fraction list[%d]" % len(exact_points), lambda: [legacy_evaluate(f, v) for v in exact_points], lambda: f.evaluate(exact_points)),
+        ("Fraction scalar", lambda: legacy_evaluate(f, scalar), lambda: f.evaluate(scalar)),
+    ]
+
+    print("degree %d polynomial" % args.degree)
+    print("%-28s %12s %12s %9s" % ("case", "legacy", "horner", "speedup"))
+    for name, legacy, horner in cases:
+        t_legacy = best_of(legacy)
+        t_horner = best_of(horner)
+        print("%-28s %10.3fms %10.3fms %8.1fx" % (name, t_legacy * 1000, t_horner * 1000, t_legacy / t_horner))
+
+if __name__ == "__main__":
+    main()
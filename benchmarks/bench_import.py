@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+"""Measure the import time of the mathvis modules with python -X importtime.
+
+Each module is imported in a fresh interpreter. The cumulative time of the module itself is \
+compared against a budget, and the slowest imports it pulled in are listed. Exits with status \
+1 if any module goes over budget or imports one of the --forbid modules (numpy and \
+matplotlib by default), so it can guard against startup regressions.
+
+Run with: python3 benchmarks/bench_import.py [--threshold MS] [--repeat N] [module ...]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+MATHVIS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mathvis")
+
+def import_times(module):
+    """{imported package: (self us, cumulative us)} for importing 'module' in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=MATHVIS + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module],
+                             env=env, capture_output=True, text=True, check=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark module import times")
+    parser.add_argument("modules", nargs="*", default=["cfractions", "polynomials"], help="Modules to import")
+    parser.add_argument("--threshold", "-t", type=float, default=100.0, help="Import time budget per module in milliseconds")
+    parser.add_argument("--repeat", "-r", type=int, default=5, help="Imports per module, the fastest is reported")
+    parser.add_argument("--forbid", nargs="*", default=["numpy", "matplotlib"], help="Modules that must not be imported")
+    parser.add_argument("--top", type=int, default=5, help="Number of slowest nested imports to list")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        best = min(runs, key=lambda times: times[module][1])
+        total = best[module][1] / 1000
+        forbidden = sorted({name.split(".")[0] for name in best} & set(args.forbid))
+        over = total > args.threshold
+        failed = failed or over or bool(forbidden)
+
+        print("{:<16} {:>9.1f} ms  (budget {:.0f} ms){}".format(module, total, args.threshold, "  OVER BUDGET" if over else ""))
+        for name, (own, cumulative) in sorted(best.items(), key=lambda item: -item[1][0])[:args.top]:
+            print("    {:<28} self {:>8.1f} ms  cumulative {:>8.1f} ms".format(name, own / 1000, cumulative / 1000))
+        if forbidden:
+            print("    imports forbidden modules: " + ", ".join(forbidden))
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
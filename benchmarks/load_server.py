@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+"""Load test for the JSON-lines server (polynomials.py --serve) on one machine.
+
+Starts a server on a temporary Unix socket (or uses a running one with --socket), sends \
+--requests requests from --connections clients with --concurrency requests in flight on \
+each, and prints the throughput, the latency seen by the clients and the server's stats.
+
+Run with: python3 benchmarks/load_server.py [--requests N] [--concurrency C] [--jobs J] [--socket PATH]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+MATHVIS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mathvis")
+sys.path.insert(0, MATHVIS)
+
+from server import Client
+
+def workload(count, distinct, seed=0):
+    """'count' (op, fields) requests drawn from 'distinct' polynomials, so repeated ones hit the server's caches"""
+    rng = random.Random(seed)
+    polynomials = [[rng.randint(1, 12)] + [rng.randint(-60, 60) for _ in range(rng.choice((2, 4, 5)))] for _ in range(distinct)]
+    requests = []
+    for _ in range(count):
+        coefficients = rng.choice(polynomials)
+        op = rng.choice(("factor", "factor", "roots", "evaluate", "factor_range"))
+        if op == "evaluate":
+            requests.append((op, {"coefficients": coefficients, "low": -10, "high": 10, "points": 201}))
+        elif op == "factor_range":
+            requests.append((op, {"coefficients": coefficients[:3], "start": 1, "stop": 9}))
+        else:
+            requests.append((op, {"coefficients": coefficients}))
+    return requests
+
+async def load(path, requests, connections, concurrency):
+    """Client-side latencies of all requests and the number of error responses"""
+    latencies, errors = [], 0
+    queue = list(reversed(requests))
+
+    async def worker(client):
+        nonlocal errors
+        while queue:
+            op, fields = queue.pop()
+            started = time.perf_counter()
+            response = await client.request(op, **fields)
+            latencies.append(time.perf_counter() - started)
+            errors += "error" in response
+
+    async def connection():
+        async with Client(path) as client:
+            await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+
+    await asyncio.gather(*(connection() for _ in range(connections)))
+    return latencies, errors
+
+async def server_stats(path):
+    async with Client(path) as client:
+        return (await client.request("stats"))["result"]
+
+def wait_for(path, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            raise RuntimeError("server did not start")
+        time.sleep(0.05)
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the mathvis JSON-lines server")
+    parser.add_argument("--requests", "-n", type=int, default=2000, help="Total number of requests")
+    parser.add_argument("--distinct", "-d", type=int, default=200, help="Number of distinct polynomials in the requests")
+    parser.add_argument("--connections", "-c", type=int, default=4, help="Client connections")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight per connection")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes of the started server (default: number of CPUs)")
+    parser.add_argument("--socket", metavar="PATH", help="Use the server already listening on PATH")
+    args = parser.parse_args()
+
+    process = None
+    path = args.socket
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(), "mathvis.sock")
+        command = [sys.executable, os.path.join(MATHVIS, "polynomials.py"), "--serve", path]
+        if args.jobs:
+            command += ["--jobs", str(args.jobs)]
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        wait_for(path, process)
+
+    try:
+        requests = workload(args.requests, args.distinct)
+        started = time.perf_counter()
+        latencies, errors = asyncio.run(load(path, requests, args.connections, args.concurrency))
+        elapsed = time.perf_counter() - started
+        stats = asyncio.run(server_stats(path))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    latencies.sort()
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+    print("%d requests in %.2fs: %.0f requests/s, %d errors" % (len(latencies), elapsed, len(latencies) / elapsed, errors))
+    print("client latency ms: p50 %.2f  p95 %.2f  p99 %.2f  max %.2f" % (percentile(0.5), percentile(0.95), percentile(0.99), latencies[-1] * 1000))
+    server = stats["latency_ms"]
+    print("server latency ms: mean %.2f  p50 %.2f  p95 %.2f  max %.2f over the last %d" % (
+        server["mean"], server["p50"], server["p95"], server["max"], server["count"]))
+    print("server: %d jobs, %d requests, at most %d in the pool, peak queue %d" % (stats["jobs"], stats["requests"], stats["max_pending"], stats["peak_queued"]))
+
+if __name__ == "__main__":
+    main()
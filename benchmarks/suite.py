@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+"""Benchmark suite for mathvis with a JSON baseline to catch performance regressions.
+
+Each benchmark is timed with timeit (best of --repeat runs of an autoranged loop). Results \
+can be saved as a baseline and later runs compared against it. A benchmark regresses when \
+it is slower than the baseline by more than its tolerance (--tolerance, overridable per \
+benchmark with NAME=FRACTION), and the suite then exits with status 1.
+
+Run with: python3 benchmarks/suite.py [-k SUBSTRING] [--save FILE] [--compare FILE [--tolerance ...]]
+or through make bench, make bench-baseline and make bench-compare.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+from fractions import Fraction
+from functools import reduce
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mathvis"))
+
+import matplotlib
+matplotlib.use("Agg")
+
+import precision
+import primes
+import polyarith
+from cfractions import CFraction
+from polynomials import Polynomial, Quadratic, prime_factor, synthetic_division
+
+def best_of(stmt, repeat=3):
+    timer = timeit.Timer(stmt)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def from_roots(roots, lead=1):
+    """Coefficients of lead * (x - r1)(x - r2)... for rational roots"""
+    return reduce(lambda p, r: polyarith.mul(p, [r.denominator, -r.numerator]), roots, [lead])
+
+def cold(function, *args):
+    """Call 'function' with the prime factorization cache, the only one factor() uses, emptied first"""
+    primes.cache_clear()
+    return function(*args)
+
+def factor(coefficients):
+    Polynomial(*coefficients).factor()
+
+def deflate(polynomial, root, times, mode):
+    """Divide out a float-contaminated root 'times' times under a precision policy"""
+    with precision.policy(mode):
+        for _ in range(times):
+            polynomial = synthetic_division(polynomial, root)[1]
+
+def plot(f):
+    import matplotlib.pyplot as plt
+    f.plot(-10, 10)
+    plt.gcf().canvas.draw()
+    plt.close("all")
+
+def benchmarks():
+    """(name, zero-argument callable) for every benchmark in the suite"""
+    a = CFraction(Fraction(3, 7), Fraction(-5, 11))
+    b = CFraction(Fraction(-2, 9), Fraction(13, 4))
+    cases = [
+        ("cfraction.add", lambda: a + b),
+        ("cfraction.mul", lambda: a * b),
+        ("cfraction.div", lambda: a / b),
+        ("cfraction.pow5", lambda: a ** 5),
+        ("cfraction.pow64", lambda: a ** 64),
+        ("cfraction.pow-7", lambda: a ** -7),
+    ]
+
+    polynomial = [Fraction(i + 1, i + 2) * (-1)**i for i in range(21)]
+    cases.append(("synthetic_division.deg20", lambda: synthetic_division(polynomial, Fraction(7, 3))))
+    contaminated = CFraction(Fraction(1, 3), 2**0.5)
+    for mode in precision.MODES:
+        cases.append(("synthetic_division.chain30." + mode, lambda mode=mode: deflate(polynomial * 2, contaminated, 30, mode)))
+    cases.append(("synthetic_division.deg20.complex", lambda: synthetic_division(polynomial, CFraction(Fraction(7, 3), Fraction(-2, 5)))))
+
+    numbers = [("smooth", 2**40 * 3**20 * 7**9 * 101**3), ("semiprime12", 999983 * 1000003),
+               ("semiprime18", 1000000007 * 1000000009)]
+    for name, n in numbers:
+        cases.append(("prime_factor." + name, lambda n=n: cold(prime_factor, n)))
+
+    for degree in (4, 6, 8):
+        small = from_roots([Fraction((-1)**i * (i + 1), i % 3 + 1) for i in range(degree)])
+        large = from_roots([Fraction((-1)**i * (i + 1) * 1009, i % 3 + 1) for i in range(degree)], lead=997)
+        cases.append(("polynomial.factor.deg%d" % degree, lambda c=small: cold(factor, c)))
+        cases.append(("polynomial.factor.deg%d.large" % degree, lambda c=large: cold(factor, c)))
+    # eight rational roots times an irreducible degree-12 factor
+    mixed = polyarith.mul(from_roots([Fraction(3, 7), Fraction(-5, 2), 11, Fraction(13, 4), -17, Fraction(19, 9), 23, Fraction(-29, 6)]),
+                          [(-1)**i * (i + 2) for i in range(13)])
+    cases.append(("polynomial.factor.deg20", lambda: cold(factor, mixed)))
+    # the constant is a hard to factor semiprime, only divisors near the real roots are tried
+    semiprime = polyarith.mul(from_roots([Fraction(1, 2), -3]), [1, 0, 5, 0, 1000000007 * 1000000009])
+    cases.append(("polynomial.factor.semiprime_constant", lambda: cold(factor, semiprime)))
+    irreducible = polyarith.mul([1, 0, 0, 0, -2], [1, 0, 3, 0, 0, -1])
+    cases.append(("polynomial.factor.irreducible", lambda: cold(factor, irreducible)))
+
+    for degree in (50, 200, 1000):
+        f = Polynomial(*[Fraction((-1)**i * (i + 1), i % 7 + 1) for i in range(degree + 1)])
+        g = Polynomial(*[i % 13 - 6 for i in range(degree + 1)])
+        cases.append(("polynomial.mul.deg%d" % degree, lambda f=f, g=g: f * g))
+        if degree >= 200:
+            cases.append(("polynomial.divmod.deg%d" % (2 * degree), lambda h=f * g, g=g: divmod(h, g)))
+
+    import numpy
+    import rootsolver
+    batch = numpy.random.default_rng(0).normal(size=(2000, 6))
+    cases.append(("rootsolver.aberth.2000x5", lambda: rootsolver.roots(batch)))
+    cases.append(("rootsolver.numpy_roots_loop.2000x5", lambda: [numpy.roots(c) for c in batch]))
+
+    q = Quadratic(3, 7, 1)
+    cases.append(("quadratic.factor", lambda: Quadratic(3, 7, 1).factor(Fraction(5, 2))))
+    cases.append(("quadratic.factor_range.200", lambda: list(q.factor_range(-100, 101))))
+    cases.append(("quadratic.factor_range.evaluate", lambda: q.factor_range(-100, 101).evaluate([-10.0, 10.0])))
+
+    cases.append(("plot.quadratic.agg", lambda: plot(Quadratic(1, -1, -6))))
+    return cases
+
+def compare(results, baseline, tolerance, overrides):
+    """Print results against the baseline and return the names of regressed benchmarks"""
+    regressions = []
+    print("%-34s %12s %12s %9s" % ("benchmark", "baseline", "current", "change"))
+    for name, seconds in results.items():
+        if name not in baseline:
+            print("%-34s %12s %10.2fus %9s" % (name, "-", seconds * 1e6, "new"))
+            continue
+        change = seconds / baseline[name] - 1
+        regressed = change > overrides.get(name, tolerance)
+        if regressed:
+            regressions.append(name)
+        print("%-34s %10.2fus %10.2fus %+8.1f%%%s" % (name, baseline[name] * 1e6, seconds * 1e6, change * 100,
+                                                    "  REGRESSION" if regressed else ""))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the mathvis benchmark suite")
+    parser.add_argument("-k", dest="select", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Timing runs per benchmark, the fastest is kept")
+    parser.add_argument("--save", metavar="FILE", help="Write the results to FILE as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Compare the results against the JSON baseline FILE")
+    parser.add_argument("--tolerance", "-t", nargs="*", default=[], metavar="[NAME=]FRACTION",
+                        help="Allowed slowdown before a benchmark counts as a regression (default 0.25), optionally per benchmark")
+    args = parser.parse_args()
+
+    tolerance = 0.25
+    overrides = {}
+    for item in args.tolerance:
+        name, _, value = item.rpartition("=")
+        if name:
+            overrides[name] = float(value)
+        else:
+            tolerance = float(value)
+
+    results = {}
+    for name, stmt in benchmarks():
+        if args.select in name:
+            results[name] = best_of(stmt, args.repeat)
+            if not args.compare:
+                print("%-34s %10.2fus" % (name, results[name] * 1e6))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, tolerance, overrides)
+        if regressions:
+            print("\n%d regression(s): %s" % (len(regressions), ", ".join(regressions)))
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+"""Batch analysis of polynomials for the polynomials CLI (--batch FILE|-).
+
+Input has one polynomial per line, coefficients in order of decreasing power of x \
+separated by whitespace or commas. Blank lines and lines starting with '#' are skipped. \
+Lines are read lazily and submitted to a process pool in chunks with a bounded number \
+of chunks in flight, so memory use doesn't grow with the input. Each result is written \
+as one JSON object per line, tagged with the input line number. Results are cached in \
+curvecache, so with a persistent cache (--cache or $MATHVIS_CACHE) a rerun skips the work.
+"""
+
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from itertools import islice
+
+import curvecache
+import instrumentation
+from polynomials import Polynomial, Quadratic
+
+# chunks in flight per worker process
+pending_per_job = 2
+
+def parse_line(line):
+    """Coefficient strings of one input line, or None for blank and comment lines"""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    return line.replace(",", " ").split()
+
+def analyze(coefficients, profile=False):
+    """Roots/factors of one polynomial as a JSON-serializable dict, cached in curvecache.default_cache().
+
+    With profile=True the result is always computed and carries the factoring stats.
+    """
+    if profile:
+        return _analyze(coefficients, True)
+    try:
+        key = curvecache.key("analyze", coefficients)
+    except (ValueError, ZeroDivisionError): # not numbers, _analyze reports the error
+        return _analyze(coefficients)
+    return dict(curvecache.default_cache().get_or_compute(key, _analyze, coefficients), coefficients=coefficients)
+
+def _analyze(coefficients, profile=False):
+    result = {"coefficients": coefficients}
+    if len(coefficients) < 3:
+        result["error"] = "Polynomial must have at least 3 terms"
+        return result
+
+    stats = instrumentation.FactorStats()
+    try:
+        if len(coefficients) == 3:
+            with stats.timer("quadratic"):
+                f = Quadratic(*coefficients)
+                factors = f.factor(1)
+            result["polynomial"] = str(f)
+            result["roots"] = [str(root) for root in f.roots]
+            result["factors"] = [str(line) for line in factors]
+        else:
+            f = Polynomial(*coefficients)
+            stats = f.factor()
+            result["polynomial"] = str(f)
+            result["factors"] = [str(factor) for factor in f.factor_sets[0]]
+    except Exception as e:
+        result["error"] = "{}: {}".format(type(e).__name__, e)
+    if profile:
+        result["stats"] = stats.as_dict()
+    return result
+
+def _analyze_chunk(chunk, profile=False):
+    """Worker entry point: analyze a list of (line number, coefficients) pairs"""
+    return [dict(analyze(coefficients, profile), line=number) for number, coefficients in chunk]
+
+def _chunks(lines, chunk_size):
+    numbered = ((number, parse_line(line)) for number, line in enumerate(lines, 1))
+    polynomials = ((number, coefficients) for number, coefficients in numbered if coefficients is not None)
+    while True:
+        chunk = list(islice(polynomials, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def run(lines, output=None, jobs=None, chunk_size=64, ordered=True, profile=False):
+    """Analyze every polynomial in the iterable 'lines' and write JSON lines to 'output'.
+
+    jobs=1 analyzes in this process, otherwise chunks are spread over 'jobs' worker processes
+    (all CPUs by default). Results keep the input order unless ordered=False, in which case each
+    chunk is written as soon as it completes. profile=True adds a "stats" object to every result.
+    Returns the number of results written.
+    """
+    output = output or sys.stdout
+    jobs = jobs or os.cpu_count() or 1
+    written = 0
+
+    def write(results):
+        nonlocal written
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+        written += len(results)
+
+    if jobs == 1:
+        for chunk in _chunks(lines, chunk_size):
+            write(_analyze_chunk(chunk, profile))
+        return written
+
+    max_pending = jobs * pending_per_job
+    # workers open their own connection to the same cache database
+    with ProcessPoolExecutor(max_workers=jobs, initializer=curvecache.configure,
+                             initargs=(curvecache.default_cache().path,)) as executor:
+        if ordered:
+            pending = deque()
+            for chunk in _chunks(lines, chunk_size):
+                if len(pending) >= max_pending:
+                    write(pending.popleft().result())
+                pending.append(executor.submit(_analyze_chunk, chunk, profile))
+            while pending:
+                write(pending.popleft().result())
+        else:
+            pending = set()
+            for chunk in _chunks(lines, chunk_size):
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        write(future.result())
+                pending.add(executor.submit(_analyze_chunk, chunk, profile))
+            for future in as_completed(pending):
+                write(future.result())
+    return written
+
+def run_file(path, output=None, **kwargs):
+    """run() over the lines of 'path', or standard input for '-'"""
+    if path == "-":
+        return run(sys.stdin, output, **kwargs)
+    with open(path) as lines:
+        return run(lines, output, **kwargs)
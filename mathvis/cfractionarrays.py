@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+
+"""Vectorized arrays of complex rationals (see cfractions.CFraction).
+
+A CFractionArray stores the numerators and denominators of the real and imaginary \
+components in four numpy arrays instead of one Python object per value, so bulk \
+arithmetic over roots or sample points runs as a handful of numpy operations.
+
+Components are held as int64 while every intermediate product provably fits, and the \
+arrays fall back to object dtype (Python ints) when it wouldn't. Results are reduced to \
+lowest terms after each operation, so they are identical to looping over CFraction \
+elements, and object arrays drop back to int64 once the values are small again.
+"""
+
+import numpy
+from fractions import Fraction
+from numbers import Integral
+
+from cfractions import CFraction
+
+_INT64_MAX = 2**63 - 1
+_FLOAT_EXACT = 2**53 # largest magnitude below which every int64 converts to float exactly
+
+def _maxabs(a):
+    """Largest magnitude in the array as a Python int"""
+    return int(numpy.max(numpy.abs(a))) if a.size else 0
+
+def _promote(limit, *arrays):
+    """Switch arrays to object dtype if an intermediate value of magnitude 'limit' would overflow int64"""
+    if limit <= _INT64_MAX:
+        return arrays
+    return tuple(a if a.dtype == object else a.astype(object) for a in arrays)
+
+def _reduce(n, d):
+    """Bring fractions n/d to lowest terms with positive denominators"""
+    g = numpy.gcd(n, d)
+    n = n // g
+    d = d // g
+    negative = d < 0
+    if negative.any():
+        n = numpy.where(negative, -n, n)
+        d = numpy.where(negative, -d, d)
+    if n.dtype == object and max(_maxabs(n), _maxabs(d)) <= _INT64_MAX:
+        n = n.astype(numpy.int64)
+        d = d.astype(numpy.int64)
+    return n, d
+
+def _add(n1, d1, n2, d2):
+    limit = max(_maxabs(n1) * _maxabs(d2) + _maxabs(n2) * _maxabs(d1), _maxabs(d1) * _maxabs(d2))
+    n1, d1, n2, d2 = _promote(limit, n1, d1, n2, d2)
+    return _reduce(n1 * d2 + n2 * d1, d1 * d2)
+
+def _mul(n1, d1, n2, d2):
+    limit = max(_maxabs(n1) * _maxabs(n2), _maxabs(d1) * _maxabs(d2))
+    n1, d1, n2, d2 = _promote(limit, n1, d1, n2, d2)
+    return _reduce(n1 * n2, d1 * d2)
+
+def _div(n1, d1, n2, d2):
+    limit = max(_maxabs(n1) * _maxabs(d2), _maxabs(d1) * _maxabs(n2))
+    n1, d1, n2, d2 = _promote(limit, n1, d1, n2, d2)
+    return _reduce(n1 * d2, d1 * n2)
+
+def _to_float(n, d):
+    if n.dtype != object and max(_maxabs(n), _maxabs(d)) <= _FLOAT_EXACT:
+        # both conversions are exact, so the division is correctly rounded just like Fraction.__float__
+        return n.astype(numpy.float64) / d.astype(numpy.float64)
+    return numpy.array([int(a) / int(b) for a, b in zip(n.ravel(), d.ravel())], dtype=numpy.float64).reshape(n.shape)
+
+def _as_int_array(values):
+    a = numpy.array(values, dtype=object)
+    if max(_maxabs(a), 1) <= _INT64_MAX:
+        return a.astype(numpy.int64)
+    return a
+
+class CFractionArray():
+    """CFractionArray(values) -> array of complex numbers with Fraction components.
+
+    'values' may be any (nested) sequence of numbers accepted by CFraction, an integer ndarray or another \
+    CFractionArray. Arithmetic is elementwise and broadcasts against scalars and other CFractionArrays.
+    """
+
+    def __init__(self, values=()):
+        if isinstance(values, CFractionArray):
+            self._rn, self._rd, self._in, self._id = values._rn, values._rd, values._in, values._id
+            return
+
+        if isinstance(values, numpy.ndarray) and values.dtype.kind in "iu":
+            self._rn = values.astype(numpy.int64)
+            self._rd = numpy.ones(values.shape, dtype=numpy.int64)
+            self._in = numpy.zeros(values.shape, dtype=numpy.int64)
+            self._id = numpy.ones(values.shape, dtype=numpy.int64)
+            return
+
+        values = numpy.array(values, dtype=object)
+        flat = [v if isinstance(v, CFraction) else CFraction(v) for v in values.ravel()]
+        shape = values.shape
+        self._rn = _as_int_array([v.real.numerator for v in flat]).reshape(shape)
+        self._rd = _as_int_array([v.real.denominator for v in flat]).reshape(shape)
+        self._in = _as_int_array([v.imag.numerator for v in flat]).reshape(shape)
+        self._id = _as_int_array([v.imag.denominator for v in flat]).reshape(shape)
+        self._unify()
+
+    @classmethod
+    def from_components(cls, real_numerator, real_denominator=1, imag_numerator=0, imag_denominator=1):
+        """Build an array from integer numerator/denominator arrays, which are broadcast together and reduced"""
+        arrays = numpy.broadcast_arrays(*(numpy.asarray(a) for a in (real_numerator, real_denominator, imag_numerator, imag_denominator)))
+        arrays = [a if a.dtype == object else a.astype(numpy.int64) for a in arrays]
+        if any((d == 0).any() for d in arrays[1::2]):
+            raise ZeroDivisionError("CFractionArray with zero denominator")
+        self = cls.__new__(cls)
+        self._rn, self._rd = _reduce(arrays[0], arrays[1])
+        self._in, self._id = _reduce(arrays[2], arrays[3])
+        self._unify()
+        return self
+
+    @classmethod
+    def _from_reduced(cls, rn, rd, imn, imd):
+        """Trusted constructor for components that are already in lowest terms"""
+        self = cls.__new__(cls)
+        self._rn, self._rd, self._in, self._id = rn, rd, imn, imd
+        self._unify()
+        return self
+
+    def _unify(self):
+        """Keep all four component arrays on the same dtype"""
+        arrays = (self._rn, self._rd, self._in, self._id)
+        if any(a.dtype == object for a in arrays) and not all(a.dtype == object for a in arrays):
+            self._rn, self._rd, self._in, self._id = (a.astype(object) for a in arrays)
+
+    @staticmethod
+    def _coerce(other):
+        if isinstance(other, CFractionArray):
+            return other
+        if isinstance(other, numpy.ndarray):
+            return CFractionArray(other)
+        value = other if isinstance(other, CFraction) else CFraction(other)
+        return CFractionArray._from_reduced(*(_as_int_array(c) for c in (value.real.numerator, value.real.denominator,
+                                                                          value.imag.numerator, value.imag.denominator)))
+
+# Properties
+    @property
+    def shape(self):
+        return self._rn.shape
+
+    @property
+    def dtype(self):
+        """numpy dtype of the stored numerators and denominators (int64 or object)"""
+        return self._rn.dtype
+
+    @property
+    def real(self):
+        """(numerator, denominator) arrays of the real components"""
+        return (self._rn, self._rd)
+
+    @property
+    def imag(self):
+        """(numerator, denominator) arrays of the imaginary components"""
+        return (self._in, self._id)
+
+    def __len__(self):
+        return len(self._rn)
+
+    def __getitem__(self, index):
+        rn, rd, imn, imd = self._rn[index], self._rd[index], self._in[index], self._id[index]
+        if numpy.ndim(rn) == 0:
+            return CFraction((int(rn), int(rd)), (int(imn), int(imd)))
+        return CFractionArray._from_reduced(rn, rd, imn, imd)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+# Methods
+    def tolist(self):
+        """Nested lists of CFraction elements"""
+        if self._rn.ndim == 0:
+            return self[()]
+        return [item.tolist() if isinstance(item, CFractionArray) else item for item in self]
+
+    def conjugate(self):
+        """Return elementwise complex conjugate (negated imaginary components)"""
+        return CFractionArray._from_reduced(self._rn, self._rd, -self._in, self._id)
+
+    def limit_denominator(self, max_denominator=1000000):
+        """Limit length of every fraction at the cost of some accuracy"""
+        components = []
+        for n, d in ((self._rn, self._rd), (self._in, self._id)):
+            n, d = n.copy(), d.copy()
+            for i in zip(*numpy.nonzero(d > max_denominator)):
+                f = Fraction(int(n[i]), int(d[i])).limit_denominator(max_denominator)
+                n[i], d[i] = f.numerator, f.denominator
+            components.append(_reduce(n, d))
+        return CFractionArray._from_reduced(*components[0], *components[1])
+
+    def to_complex(self):
+        """Convert to a numpy complex128 array"""
+        result = numpy.empty(self.shape, dtype=numpy.complex128)
+        result.real = _to_float(self._rn, self._rd)
+        result.imag = _to_float(self._in, self._id)
+        return result
+
+    def __array__(self, dtype=None, copy=None):
+        result = self.to_complex()
+        return result if dtype is None else result.astype(dtype)
+
+# Comparison operators
+    def __eq__(self, other):
+        """Elementwise equality, as a numpy bool array"""
+        other = CFractionArray._coerce(other)
+        return (self._rn == other._rn) & (self._rd == other._rd) & (self._in == other._in) & (self._id == other._id)
+
+    def __ne__(self, other):
+        return ~self.__eq__(other)
+
+    __hash__ = None
+
+# Unary operators
+    def __neg__(self):
+        return CFractionArray._from_reduced(-self._rn, self._rd, -self._in, self._id)
+
+    def __pos__(self):
+        return self
+
+# Binary operators
+    def __add__(self, other):
+        other = CFractionArray._coerce(other)
+        return CFractionArray._from_reduced(*_add(self._rn, self._rd, other._rn, other._rd),
+                                            *_add(self._in, self._id, other._in, other._id))
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        return self.__add__(-CFractionArray._coerce(other))
+
+    def __rsub__(self, other):
+        return (-self).__add__(other)
+
+    def __mul__(self, other):
+        other = CFractionArray._coerce(other)
+        rr = _mul(self._rn, self._rd, other._rn, other._rd)
+        ii = _mul(self._in, self._id, other._in, other._id)
+        ri = _mul(self._rn, self._rd, other._in, other._id)
+        ir = _mul(self._in, self._id, other._rn, other._rd)
+        return CFractionArray._from_reduced(*_add(rr[0], rr[1], -ii[0], ii[1]), *_add(ri[0], ri[1], ir[0], ir[1]))
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        other = CFractionArray._coerce(other)
+        norm = _add(*_mul(other._rn, other._rd, other._rn, other._rd), *_mul(other._in, other._id, other._in, other._id))
+        if (norm[0] == 0).any():
+            raise ZeroDivisionError("complex division by zero")
+
+        rr = _mul(self._rn, self._rd, other._rn, other._rd)
+        ii = _mul(self._in, self._id, other._in, other._id)
+        ir = _mul(self._in, self._id, other._rn, other._rd)
+        ri = _mul(self._rn, self._rd, other._in, other._id)
+        real = _div(*_add(rr[0], rr[1], ii[0], ii[1]), *norm)
+        imag = _div(*_add(ir[0], ir[1], -ri[0], ri[1]), *norm)
+        return CFractionArray._from_reduced(*real, *imag)
+
+    def __rtruediv__(self, other):
+        return CFractionArray._coerce(other).__truediv__(self)
+
+    def __pow__(self, power):
+        """Raise every element to an integer power by repeated squaring"""
+        if not isinstance(power, Integral):
+            raise TypeError("CFractionArray only supports integer powers, not '{}'".format(power.__class__.__name__))
+
+        base = self if power >= 0 else 1 / self
+        power = abs(int(power))
+        result = CFractionArray.from_components(numpy.ones(self.shape, dtype=numpy.int64))
+        while power:
+            if power & 1:
+                result = result * base
+            power >>= 1
+            if power:
+                base = base * base
+        return result
+
+# Conversions
+    def __str__(self):
+        return str(numpy.array(self.tolist(), dtype=object))
+
+    def __repr__(self):
+        return "CFractionArray(%s)" % self.tolist()
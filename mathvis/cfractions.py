@@ -17,58 +17,178 @@ Accuracy is not preserved during the following computations:
         certain floats are able to be converted to Fractions correctly but most aren't
     - CFraction raised to a non-integer power
 
+Internally the value is kept as a Gaussian integer over a common denominator, (a+b*j)/d, \
+so arithmetic runs on plain integers and each result is reduced once. The Fraction \
+components are built on demand when .real or .imag is read. Under a bounded precision \
+policy (see precision.py) results and float conversions are rounded to a shared \
+denominator of at most the policy's max_denominator.
+
 Aside from the use of the Fraction class to store values, this class attempts to \
 behave as closely as possible to the built-in complex class.
 """
 
 import copy
 import math
-import operator
 from collections.abc import Iterable
 from fractions import Fraction
-from functools import reduce
 from numbers import Complex, Rational, Real
+import precision
 
 class _Fraction(Fraction):
     """Extend Fraction to override __repr__, to match functionality of complex() in the interpreter"""
 
+    __slots__ = ()
+
     def __repr__(self):
         return self.__str__()
 
+# Exact types checked with type() rather than isinstance(), since ABC instance checks dominate the cost of small operations
+_RATIONAL_TYPES = frozenset((int, Fraction, _Fraction))
+
+def _fraction(numerator, denominator=1):
+    """Build a _Fraction from a numerator and a positive denominator that are already coprime, skipping normalization"""
+    f = object.__new__(_Fraction)
+    f._numerator = numerator
+    f._denominator = denominator
+    return f
+
+def _component(value):
+    """Reuse an int or an already normalized Fraction as a _Fraction component without reducing it again"""
+    t = type(value)
+    if t is _Fraction:
+        return value
+    if t is Fraction or isinstance(value, Fraction):
+        return _fraction(value.numerator, value.denominator)
+    if t is int or isinstance(value, int):
+        return _fraction(int(value))
+    return _Fraction(value)
+
+def _coerce(value):
+    """Coerce a public constructor argument to a _Fraction component"""
+    if type(value) in _RATIONAL_TYPES:
+        return _component(value)
+    # Support passing tuples as (numerator,denominator) pairs
+    if isinstance(value, Iterable) and not isinstance(value, str) and len(value) == 2:
+        return _Fraction(*value)
+    return _Fraction(value)
+
+def _rational(value):
+    """(numerator, denominator) of an int or Fraction operand"""
+    if type(value) is int:
+        return (value, 1)
+    return (value.numerator, value.denominator)
+
+def _gaussian_power(x, y, power):
+    """(x + yj)**power for integers x, y and power >= 0 by binary exponentiation, as a (real, imag) pair"""
+    real, imag = 1, 0
+    while power:
+        if power & 1:
+            real, imag = real * x - imag * y, real * y + imag * x
+        power >>= 1
+        if power:
+            x, y = x * x - y * y, 2 * x * y
+    return (real, imag)
+
 class CFraction(Complex):
     """CFraction(real[, imag]) -> complex number with components stored as Fraction instances.
 
     Create a complex number from a real part and an optional imaginary part. CFraction is interoperable with the built-in complex class, but of course this loses the benefit of Fraction components.
     """
 
+    # The value is held as a Gaussian integer over a shared denominator, (a + bj)/d with d > 0 and
+    # gcd(a, b, d) == 1, so the operators work on plain ints and reduce once per result. The Fraction
+    # components are only built when .real or .imag is read, and then kept.
+    __slots__ = ("_a", "_b", "_d", "_real", "_imag")
+
     def __init__(self, real=0, imag=0):
         """Coerce real and imaginary components to fractions"""
-        if isinstance(real, Complex) and imag == 0:
-            real, imag = (real.real, real.imag)
-        # Support passing tuples as (numerator,denominator) pairs
-        self._real = _Fraction(*real) if isinstance(real, Iterable) and len(real) == 2 else _Fraction(real)
-        self._imag = _Fraction(*imag) if isinstance(imag, Iterable) and len(imag) == 2 else _Fraction(imag)
+        if type(real) in _RATIONAL_TYPES and type(imag) in _RATIONAL_TYPES:
+            real, imag = _component(real), _component(imag)
+        else:
+            if isinstance(real, Complex) and imag == 0:
+                real, imag = (real.real, real.imag)
+            real, imag = _coerce(real), _coerce(imag)
+        self._set_fractions(real, imag)
+        policy = precision.current()
+        if policy.bound is not None and self._d > policy.bound:
+            self._bounded(policy)
+
+    def _set_fractions(self, real, imag):
+        """Set the value from two _Fraction components. With d = lcm of their denominators (a + bj)/d is already reduced."""
+        rd, jd = real._denominator, imag._denominator
+        if rd == jd:
+            self._a, self._b, self._d = real._numerator, imag._numerator, rd
+        else:
+            d = rd * jd // math.gcd(rd, jd)
+            self._a, self._b, self._d = real._numerator * (d // rd), imag._numerator * (d // jd), d
+        self._real = real
+        self._imag = imag
+
+    @classmethod
+    def _from_fractions(cls, real, imag):
+        """Trusted constructor: real and imag must be ints or normalized Fractions"""
+        self = object.__new__(cls)
+        self._set_fractions(_component(real), _component(imag))
+        return self
+
+    @classmethod
+    def _from_reduced(cls, a, b, d):
+        """Trusted constructor for (a + bj)/d that is already in lowest terms with d > 0"""
+        self = object.__new__(cls)
+        self._a, self._b, self._d = a, b, d
+        self._real = self._imag = None
+        policy = precision.current()
+        if policy.bound is not None and d > policy.bound:
+            self._bounded(policy)
+        return self
+
+    @classmethod
+    def _from_gaussian(cls, a, b, d):
+        """(a + bj)/d for integers with d != 0, reduced once"""
+        if d < 0:
+            a, b, d = -a, -b, -d
+        g = math.gcd(math.gcd(a, b), d)
+        if g != 1:
+            a, b, d = a // g, b // g, d // g
+        return cls._from_reduced(a, b, d)
+
+    def _bounded(self, policy):
+        """Round (a + bj)/d to the nearest multiple of 1/bound in both components, recording the error"""
+        a, b, d, bound = self._a, self._b, self._d, policy.bound
+        a2, b2 = policy.round(a, d), policy.round(b, d)
+        policy.record(math.hypot((a * bound - a2 * d) / (d * bound), (b * bound - b2 * d) / (d * bound)))
+        g = math.gcd(math.gcd(a2, b2), bound)
+        self._a, self._b, self._d = a2 // g, b2 // g, bound // g
+        self._real = self._imag = None
 
 # Properties
     @property
     def real(self):
         """Real component of complex number"""
+        if self._real is None:
+            a, d = self._a, self._d
+            g = math.gcd(a, d)
+            self._real = _fraction(a // g, d // g) if g != 1 else _fraction(a, d)
         return self._real
 
     @property
     def imag(self):
         """Imaginary component of complex number"""
+        if self._imag is None:
+            b, d = self._b, self._d
+            g = math.gcd(b, d)
+            self._imag = _fraction(b // g, d // g) if g != 1 else _fraction(b, d)
         return self._imag
 
 # Methods
     def conjugate(self):
         """Return complex conjugate (negated imaginary component)"""
-        return CFraction(self.real, -1 * self.imag)
+        return CFraction._from_reduced(self._a, -self._b, self._d)
 
     def limit_denominator(self, max_denominator=1000000):
         """Limit length of fraction at the cost of some accuracy"""
-        return CFraction(self.real.limit_denominator(max_denominator),
-                         self.imag.limit_denominator(max_denominator))
+        return CFraction._from_fractions(self.real.limit_denominator(max_denominator),
+                                         self.imag.limit_denominator(max_denominator))
 
 # Comparison operators
     def __eq__(self, other):
@@ -76,8 +196,13 @@ class CFraction(Complex):
         if other is None:
             return False
 
+        if type(other) is CFraction: # the reduced form is unique
+            return self._a == other._a and self._b == other._b and self._d == other._d
+        if type(other) in _RATIONAL_TYPES:
+            n, m = _rational(other)
+            return self._b == 0 and self._a == n and self._d == m
         if isinstance(other, Real):
-            return self.imag == 0 and self.real == other
+            return self._b == 0 and self.real == other
         return self.imag == other.imag and self.real == other.real
 
     def __ne__(self, other):
@@ -86,13 +211,13 @@ class CFraction(Complex):
 # Unary operators
     def __abs__(self):
         """Return magnitude of complex number sqrt(a**2 + b**2)"""
-        return _Fraction(math.sqrt(self.real**2 + self.imag**2))
+        return _component(precision.current().limit(_Fraction(math.sqrt(self.real**2 + self.imag**2))))
 
     def __neg__(self):
-        return CFraction(-1 * self.real, -1 * self.imag)
+        return CFraction._from_reduced(-self._a, -self._b, self._d)
 
     def __pos__(self):
-        return CFraction(self.real, self.imag)
+        return CFraction._from_reduced(self._a, self._b, self._d)
 
     def __hash__(self):
         """Lifted this algorithm from implementation of built-in complex().__hash__ in complex_hash(PyComplexObject*) in Objects/complexobject.c"""
@@ -118,19 +243,59 @@ class CFraction(Complex):
         return self.__class__(copy.deepcopy(self.real, memo), copy.deepcopy(self.imag, memo))
 
 # Binary operators
+    # CFraction and Rational operands work on the (a + bj)/d integers directly, anything else
+    # (float, complex, ...) goes through the Fraction components and the public constructor
+    def _add(self, a, b, d):
+        """self + (a + bj)/d for a reduced operand, cancelling through gcd(d1, d2) like Fraction addition"""
+        d1 = self._d
+        g = math.gcd(d1, d)
+        if g == 1:
+            return CFraction._from_reduced(self._a * d + a * d1, self._b * d + b * d1, d1 * d)
+        s, t = d1 // g, d // g
+        a, b = self._a * t + a * s, self._b * t + b * s
+        g2 = math.gcd(math.gcd(a, b), g)
+        if g2 == 1:
+            return CFraction._from_reduced(a, b, s * d)
+        return CFraction._from_reduced(a // g2, b // g2, s * (d // g2))
+
+    def _scale(self, n, m):
+        """self * n/m for a reduced rational n/m (m > 0), cancelling across like Fraction multiplication"""
+        g1 = math.gcd(n, self._d)
+        g2 = math.gcd(math.gcd(self._a, self._b), m)
+        n //= g1
+        return CFraction._from_reduced(self._a // g2 * n, self._b // g2 * n, self._d // g1 * (m // g2))
+
     def __add__(self, other):
+        if type(other) is CFraction:
+            return self._add(other._a, other._b, other._d)
+        if type(other) in _RATIONAL_TYPES:
+            n, m = _rational(other)
+            return self._add(n, 0, m)
         return CFraction(self.real + other.real, self.imag + other.imag)
 
     def __radd__(self, other):
         return self.__add__(other)
 
     def __sub__(self, other):
+        if type(other) is CFraction:
+            return self._add(-other._a, -other._b, other._d)
+        if type(other) in _RATIONAL_TYPES:
+            n, m = _rational(other)
+            return self._add(-n, 0, m)
         return self.__add__(-1 * other)
 
     def __rsub__(self, other):
+        if type(other) in _RATIONAL_TYPES:
+            n, m = _rational(other)
+            return (-self)._add(n, 0, m)
         return (-1 * self).__add__(other)
 
     def __mul__(self, other):
+        if type(other) is CFraction:
+            a1, b1, a2, b2 = self._a, self._b, other._a, other._b
+            return CFraction._from_gaussian(a1 * a2 - b1 * b2, a1 * b2 + b1 * a2, self._d * other._d)
+        if type(other) in _RATIONAL_TYPES:
+            return self._scale(*_rational(other))
         return CFraction(self.real * other.real - self.imag * other.imag, self.real * other.imag + self.imag * other.real)
 
     def __rmul__(self, other):
@@ -140,8 +305,17 @@ class CFraction(Complex):
         if other == 0:
             raise ZeroDivisionError("complex division by zero")
 
-        return CFraction((self.real * other.real + self.imag * other.imag, other.real**2 + other.imag**2),
-                         (self.imag * other.real - self.real * other.imag, other.real**2 + other.imag**2))
+        if type(other) is CFraction:
+            # ((a1 + b1j)/d1) / ((a2 + b2j)/d2) = d2 (a1 + b1j)(a2 - b2j) / (d1 (a2**2 + b2**2))
+            a1, b1, a2, b2 = self._a, self._b, other._a, other._b
+            d2 = other._d
+            return CFraction._from_gaussian((a1 * a2 + b1 * b2) * d2, (b1 * a2 - a1 * b2) * d2, self._d * (a2 * a2 + b2 * b2))
+        if type(other) in _RATIONAL_TYPES:
+            n, m = _rational(other)
+            return self._scale(m, n) if n > 0 else self._scale(-m, -n)
+        norm = other.real**2 + other.imag**2
+        return CFraction((self.real * other.real + self.imag * other.imag) / norm,
+                         (self.imag * other.real - self.real * other.imag) / norm)
 
     def __rtruediv__(self, other):
         return CFraction(other).__truediv__(self)
@@ -175,13 +349,7 @@ class CFraction(Complex):
                 # I think Fraction always stores the sign in the numerator, but I'm not 100% sure.
                 # this compensates just in case the numerator and denominator can vary in sign
                 power = abs(power.numerator) if power >= 0 else -1 * abs(power.numerator)
-                if power >= 0: # for positive and zero powers, just multiply repeatedly
-                    return reduce(operator.mul, (a for _ in range(power)), CFraction(1))
-                elif power < 0: # for negative exponents, invert fraction then raise to positive power
-                    rn, rd = (a.real.numerator, a.real.denominator)
-                    jn, jd = (a.imag.numerator, a.imag.denominator)
-                    new_d = rn**2 * jd**2 + rd**2 * jn**2
-                    return CFraction((rd * rn * jd**2, new_d), (-1 * rd**2 * jn * jd, new_d))**abs(power)
+                return a._integer_power(power)
 
             else: # non-integer exponents use this https://stackoverflow.com/questions/3099403/calculating-complex-numbers-with-rational-exponents
                 theta = math.atan2(a.imag, a.real)
@@ -197,6 +365,25 @@ class CFraction(Complex):
         else:
             raise TypeError("unsupported operand type(s) for ** or pow(): '{}' and '{}'".format(a.__class__.__name__, power.__class__.__name__))
 
+    def _integer_power(self, power):
+        """Exact integer power with O(log(power)) multiplications.
+
+        Only the Gaussian integer numerator (x + yj) is raised to the power by repeated squaring.
+        Negative powers invert up front, 1/((x + yj)/d) = d(x - yj)/(x**2 + y**2), instead of per step.
+        """
+        x, y, d = self._a, self._b, self._d
+
+        if power < 0:
+            x, y, d = x * d, -y * d, x * x + y * y
+            g = math.gcd(math.gcd(x, y), d)
+            x, y, d = x // g, y // g, d // g
+            power = -power
+
+        real, imag = _gaussian_power(x, y, power)
+        if d == 1: # Gaussian integer, nothing to reduce
+            return CFraction._from_reduced(real, imag, 1)
+        return CFraction._from_gaussian(real, imag, d**power)
+
     def __rpow__(power, a):
         return CFraction(a).__pow__(power)
 
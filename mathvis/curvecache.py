@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+"""LRU cache of computed curves and factorizations, shared by the CLI, batch mode and the window.
+
+Entries are keyed by normalized coefficients plus whatever else the result depends on (x \
+range, resolution, the precision policy), so "1", "1.0" and 1 hit the same entry. The in-memory LRU is bounded \
+both by entry count and by approximate size in bytes. With a path, entries are also \
+written to a sqlite database and read back on a memory miss, so a restarted process starts \
+warm. The process-wide default_cache() persists to $MATHVIS_CACHE when it is set.
+"""
+
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from fractions import Fraction
+
+import precision
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "disk_hits", "maxsize", "maxbytes", "currsize", "currbytes"])
+
+default_maxsize = 256
+default_maxbytes = 64 * 2**20
+
+def key(kind, coefficients, *extra):
+    """Cache key for a result of type 'kind' computed from 'coefficients' and the hashable 'extra' arguments.
+
+    The current precision policy is part of the key, so bounded results are never read back by an exact run.
+    """
+    policy = precision.current()
+    exactness = ("exact",) if policy.mode == "exact" else (policy.mode, policy.max_denominator)
+    return (kind, tuple(str(Fraction(c)) for c in coefficients)) + extra + exactness
+
+def sizeof(value):
+    """Approximate size of a cached value in bytes, counting numpy array buffers"""
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None: # getsizeof only includes the buffer for arrays owning their data
+        return max(sys.getsizeof(value), nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+class CurveCache():
+    """Thread-safe LRU cache holding at most 'maxsize' entries and 'maxbytes' bytes, persisted to the sqlite file 'path' if given"""
+
+    def __init__(self, maxsize=default_maxsize, maxbytes=default_maxbytes, path=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.path = path
+        self.hits = self.misses = self.disk_hits = 0
+        self._entries = OrderedDict() # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        self._pid = None
+
+    def _connection(self):
+        """sqlite connection for this process, reopened after a fork"""
+        if self.path is None:
+            return None
+        if self._db is None or self._pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB)")
+            self._pid = os.getpid()
+        return self._db
+
+    def _store(self, key, value):
+        size = sizeof(value)
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        if size > self.maxbytes:
+            return
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while len(self._entries) > self.maxsize or self._bytes > self.maxbytes:
+            self._bytes -= self._entries.popitem(last=False)[1][1]
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            db = self._connection()
+            if db is not None:
+                row = db.execute("SELECT value FROM entries WHERE key = ?", (repr(key),)).fetchone()
+                if row is not None:
+                    value = pickle.loads(row[0])
+                    self._store(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._store(key, value)
+            db = self._connection()
+            if db is not None:
+                with db:
+                    db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?)", (repr(key), pickle.dumps(value)))
+
+    def get_or_compute(self, key, compute, *args):
+        """Cached value for 'key', calling compute(*args) and caching the result on a miss"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute(*args)
+            self.put(key, value)
+        return value
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.disk_hits, self.maxsize, self.maxbytes, len(self._entries), self._bytes)
+
+    def clear(self, disk=False):
+        """Empty the memory cache and reset the statistics, and the database too if disk=True"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.disk_hits = 0
+            db = self._connection() if disk else None
+            if db is not None:
+                with db:
+                    db.execute("DELETE FROM entries")
+
+    def close(self):
+        with self._lock:
+            if self._db is not None and self._pid == os.getpid():
+                self._db.close()
+            self._db = None
+
+_default = None
+
+def default_cache():
+    """The process-wide cache, persisted to $MATHVIS_CACHE if that is set"""
+    global _default
+    if _default is None:
+        _default = CurveCache(path=os.environ.get("MATHVIS_CACHE") or None)
+    return _default
+
+def configure(path=None, maxsize=default_maxsize, maxbytes=default_maxbytes):
+    """Replace the process-wide cache, e.g. for --cache PATH. Also the initializer of batch worker processes."""
+    global _default
+    if _default is not None:
+        _default.close()
+    _default = CurveCache(maxsize, maxbytes, path)
+    return _default
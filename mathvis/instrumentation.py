@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+"""Counters, stage timers and hooks for the factoring pipeline.
+
+Polynomial.factor returns a FactorStats with how many rational root candidates were \
+generated inside the real root intervals, skipped and tested, how many synthetic divisions ran, and the time spent in \
+each stage. Callbacks registered with add_hook are called with (event, data) as the \
+pipeline runs, e.g. ("candidate", {"root": r, "is_root": False}), for tracing without \
+print statements in the hot loop.
+"""
+
+import time
+from contextlib import contextmanager
+
+COUNTERS = ("squarefree_parts", "candidates_generated", "candidates_skipped", "candidates_tested", "synthetic_divisions", "roots_found")
+STAGES = ("factor", "squarefree", "isolation", "candidates", "deflation", "quadratic", "irreducible")
+
+_hooks = []
+
+def add_hook(hook):
+    """Call hook(event, data) for every pipeline event"""
+    _hooks.append(hook)
+
+def remove_hook(hook):
+    _hooks.remove(hook)
+
+def hooks_active():
+    return bool(_hooks)
+
+def emit(event, **data):
+    for hook in _hooks:
+        hook(event, data)
+
+class FactorStats():
+    """Counters and per-stage timers (seconds) of one or more factoring runs"""
+
+    def __init__(self):
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.timers = dict.fromkeys(STAGES, 0.0)
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timers[stage] += elapsed
+            if _hooks:
+                emit("stage", stage=stage, seconds=elapsed)
+
+    def merge(self, other):
+        """Add the counts and times of 'other' to these, e.g. to total a batch"""
+        for name, value in other.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        for stage, seconds in other.timers.items():
+            self.timers[stage] = self.timers.get(stage, 0.0) + seconds
+        return self
+
+    def as_dict(self):
+        return {"counters": dict(self.counters), "timers": dict(self.timers)}
+
+    def summary(self):
+        """Human readable table of the counters and timers"""
+        lines = ["%-22s %10d" % (name, value) for name, value in self.counters.items()]
+        lines += ["%-22s %8.3fms" % (stage + " time", seconds * 1000) for stage, seconds in self.timers.items()]
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return "FactorStats(%r)" % self.as_dict()
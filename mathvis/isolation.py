@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+"""Real root isolation for polynomials with rational coefficients.
+
+Root bounds (Cauchy's and Lagrange's) limit where the real roots can be, Descartes' rule of \
+signs bounds how many are positive or negative, and a Sturm sequence counts the distinct \
+real roots in an interval exactly. real_root_intervals bisects the bounded range until \
+every interval holds exactly one distinct root, and refine narrows an interval further \
+from the sign of the polynomial alone.
+
+Coefficients are in order of decreasing power, as in polyarith. Intervals are pairs \
+(low, high) of Fractions containing one root x with low < x <= high, or low == high when \
+the root was hit exactly.
+"""
+
+import math
+from fractions import Fraction
+from functools import reduce
+import polyarith
+
+def cauchy_bound(coefficients):
+    """1 + max |a_i / a_n|, larger than the absolute value of every root"""
+    a = polyarith.trim(coefficients)
+    return 1 + max((abs(Fraction(c, 1) / a[0]) for c in a[1:]), default=0)
+
+def lagrange_bound(coefficients):
+    """Sum of the two largest |a_(n-k) / a_n|**(1/k), at least the absolute value of every root.
+
+    Each k-th root is rounded up to a power of two so the bound stays exact without floats.
+    """
+    a = polyarith.trim(coefficients)
+    terms = sorted(_power_of_two_root(abs(Fraction(c, 1) / a[0]), k) for k, c in enumerate(a[1:], 1) if c)
+    return sum(terms[-2:], Fraction(0))
+
+def _power_of_two_root(ratio, k):
+    """Smallest power of two 2**e (e may be negative) with (2**e)**k >= ratio > 0"""
+    num, den = ratio.numerator, ratio.denominator
+    def at_least(e):
+        return num <= den << (e * k) if e >= 0 else num << (-e * k) <= den
+    e = -(-(num.bit_length() - den.bit_length() - 1) // k)
+    while not at_least(e):
+        e += 1
+    while at_least(e - 1):
+        e -= 1
+    return Fraction(2)**e
+
+def root_bound(coefficients):
+    """The smaller of the Cauchy and Lagrange bounds, so |x| <= root_bound for every root x"""
+    return min(cauchy_bound(coefficients), lagrange_bound(coefficients))
+
+def sign_variations(values):
+    "sign_variations([1, 0, -2, 3]) --> 2, zeros are skipped"
+    variations, last = 0, 0
+    for v in values:
+        if v:
+            if (v > 0) != (last > 0) and last:
+                variations += 1
+            last = v
+    return variations
+
+def descartes_bounds(coefficients):
+    """(positive, negative) upper bounds on the number of positive and negative roots counted with multiplicity.
+
+    By Descartes' rule of signs the true counts are smaller by an even number, so a bound of 0 or 1 is exact.
+    """
+    n = len(coefficients) - 1
+    return (sign_variations(coefficients), sign_variations([-c if (n - i) % 2 else c for i, c in enumerate(coefficients)]))
+
+def _integer_squarefree(coefficients):
+    """Primitive square-free integer polynomial with the same distinct roots, leading coefficient positive"""
+    _, a = polyarith.integer_primitive(coefficients)
+    if not a:
+        return a
+    if a[0] < 0:
+        a = [-c for c in a]
+    if len(a) > 2:
+        g = polyarith.gcd(a, polyarith.derivative(a))
+        if len(g) > 1:
+            _, a = polyarith.integer_primitive(polyarith.exact_divide(a, g))
+    return a
+
+def sign_at(coefficients, x):
+    """Sign (-1, 0 or 1) of the integer polynomial at the Fraction x, evaluated in integers"""
+    return _sign(coefficients, x.numerator, x.denominator)
+
+def _sign(coefficients, p, q):
+    """Sign of q**n * f(p/q) for q > 0, the sign of f(p/q)"""
+    result, power = coefficients[0], 1
+    for c in coefficients[1:]:
+        power *= q
+        result = result * p + c * power
+    return (result > 0) - (result < 0)
+
+def sturm_sequence(coefficients):
+    """Sturm sequence f, f', -rem(f, f'), ... of an integer polynomial, each term kept primitive in the integers"""
+    _, f = polyarith.integer_primitive(coefficients)
+    sequence = [f, polyarith.derivative(f)]
+    while len(sequence[-1]) > 1:
+        a, b = sequence[-2], sequence[-1]
+        r = polyarith.pseudo_remainder(a, b)
+        if not r:
+            break
+        # prem multiplies by lc(b)**(deg a - deg b + 1), which may be negative
+        sign = -1 if b[0] > 0 or (len(a) - len(b)) % 2 else 1
+        g = reduce(math.gcd, r, 0)
+        sequence.append([sign * c // g for c in r])
+    return sequence
+
+def sturm_count(sequence, low, high):
+    """Number of distinct real roots x of sequence[0] with low < x <= high"""
+    return _variations(sequence, low.numerator, low.denominator) - _variations(sequence, high.numerator, high.denominator)
+
+def _variations(sequence, p, q):
+    """Sign variations of the Sturm sequence at p/q, sharing the powers of q between its terms"""
+    powers = [1]
+    for _ in range(len(sequence[0]) - 1):
+        powers.append(powers[-1] * q)
+    variations, last = 0, 0
+    for f in sequence:
+        value = 0
+        for i, c in enumerate(f):
+            value = value * p + c * powers[i]
+        if value:
+            # q**n * f(p/q) has the sign of f(p/q) since q > 0
+            if last and (value > 0) != (last > 0):
+                variations += 1
+            last = value
+    return variations
+
+def real_root_intervals(coefficients, width=None):
+    """Sorted isolating intervals (low, high] of the distinct real roots of a polynomial with rational coefficients.
+
+    With 'width' every interval is refined to at most that width.
+    """
+    f = _integer_squarefree(coefficients)
+    if len(f) < 2:
+        return []
+    if len(f) == 2:
+        root = Fraction(-f[1], f[0])
+        return [(root, root)]
+
+    # a power of two bound keeps every bisection point an integer over a power of two
+    bound, limit = 1, root_bound(f)
+    while bound < limit:
+        bound <<= 1
+    positive, negative = descartes_bounds(f)
+    low, high = -bound if negative else 0, bound if positive else 0
+    intervals = []
+    if _sign(f, low, 1) == 0: # (low, high] leaves out a root at the lower bound
+        intervals.append((Fraction(low), Fraction(low)))
+
+    # intervals are (low/scale, high/scale] with the Sturm variations at both ends
+    sequence = sturm_sequence(f)
+    pending = [(low, high, 1, _variations(sequence, low, 1), _variations(sequence, high, 1))]
+    while pending:
+        low, high, scale, v_low, v_high = pending.pop()
+        count = v_low - v_high
+        if count == 1:
+            intervals.append((Fraction(low, scale), Fraction(high, scale)))
+        elif count > 1:
+            low, high, scale = 2 * low, 2 * high, 2 * scale
+            mid = (low + high) // 2
+            v_mid = _variations(sequence, mid, scale)
+            pending.append((low, mid, scale, v_low, v_mid))
+            pending.append((mid, high, scale, v_mid, v_high))
+    if width is not None:
+        intervals = [refine(f, interval, width) for interval in intervals]
+    return sorted(intervals)
+
+def refine(coefficients, interval, width):
+    """Narrow an isolating interval of a simple root of the integer polynomial by bisection to at most 'width'.
+
+    Only the sign of the polynomial is used, which changes across a simple root. Returns (x, x) if a
+    bisection point hits the root exactly.
+    """
+    low, high = interval
+    if _sign(coefficients, high.numerator, high.denominator) == 0:
+        return (high, high)
+    # bisect (low/scale, high/scale] in integers, doubling the scale each step
+    scale = math.lcm(low.denominator, high.denominator)
+    low, high = low.numerator * (scale // low.denominator), high.numerator * (scale // high.denominator)
+    s_high = _sign(coefficients, high, scale)
+    while (high - low) * width.denominator > width.numerator * scale:
+        low, high, scale = 2 * low, 2 * high, 2 * scale
+        mid = (low + high) // 2
+        s_mid = _sign(coefficients, mid, scale)
+        if s_mid == 0:
+            return (Fraction(mid, scale), Fraction(mid, scale))
+        if s_mid == s_high:
+            high = mid
+        else:
+            low = mid
+    return (Fraction(low, scale), Fraction(high, scale))
+
+def view_range(intervals, margin=Fraction(1, 4), default=(-10, 10)):
+    """x range around all the intervals, widened by 'margin' of their spread (at least 1) on each side, or 'default' without any"""
+    if not intervals:
+        return tuple(Fraction(x) for x in default)
+    low, high = min(low for low, _ in intervals), max(high for _, high in intervals)
+    pad = max((high - low) * margin, Fraction(1))
+    return (low - pad, high + pad)
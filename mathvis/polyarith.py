@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+
+"""Dense polynomial arithmetic on coefficient lists.
+
+Polynomials are lists of coefficients in order of decreasing power of x, the same \
+convention as Polynomial.coefficients and synthetic_division. Results are trimmed of \
+leading zeros and the zero polynomial is the empty list. Functions work on any \
+coefficients that support +, - and * (int, Fraction, CFraction) unless stated otherwise.
+"""
+
+import math
+from fractions import Fraction
+from functools import reduce
+
+def trim(a):
+    "trim([0, 0, 1, 2]) --> [1, 2]"
+    i = 0
+    while i < len(a) and a[i] == 0:
+        i += 1
+    return list(a[i:])
+
+def degree(a):
+    """Degree of a trimmed polynomial, -1 for the zero polynomial"""
+    return len(a) - 1
+
+def add(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    offset = len(a) - len(b)
+    return trim(a[:offset] + [x + y for x, y in zip(a[offset:], b)])
+
+def sub(a, b):
+    return add(a, [-y for y in b])
+
+def scale(a, c):
+    return trim([x * c for x in a])
+
+# shorter factor length from which mul switches to Karatsuba, and to Kronecker substitution for rationals
+karatsuba_threshold = 24
+kronecker_threshold = 48
+
+def mul(a, b):
+    """Product of two polynomials.
+
+    Schoolbook below karatsuba_threshold terms, Kronecker substitution (one big integer product) for
+    int and Fraction coefficients from kronecker_threshold terms and Karatsuba otherwise.
+    """
+    if not a or not b:
+        return []
+    shorter = min(len(a), len(b))
+    if shorter < karatsuba_threshold:
+        return trim(_schoolbook(a, b))
+    if shorter >= kronecker_threshold and _rational(a) and _rational(b):
+        return kronecker_mul(a, b)
+    return trim(_karatsuba(a[::-1], b[::-1])[::-1])
+
+def _rational(a):
+    return all(type(c) is int or type(c) is Fraction for c in a)
+
+def _schoolbook(a, b):
+    result = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                result[i + j] += x * y
+    return result
+
+def _karatsuba(a, b):
+    """Product of coefficient lists in order of increasing power, untrimmed"""
+    if not a or not b:
+        return []
+    if min(len(a), len(b)) < karatsuba_threshold:
+        return _schoolbook(a, b)
+
+    # a = a0 + a1 x^m, b = b0 + b1 x^m and a1 b0 + a0 b1 = (a0 + a1)(b0 + b1) - a0 b0 - a1 b1
+    m = max(len(a), len(b)) // 2
+    a0, a1, b0, b1 = a[:m], a[m:], b[:m], b[m:]
+    z0 = _karatsuba(a0, b0)
+    z2 = _karatsuba(a1, b1)
+    z1 = _karatsuba(_add_low(a0, a1), _add_low(b0, b1))
+
+    result = [0] * max(len(a) + len(b) - 1, m + len(z1), 2 * m + len(z2))
+    for i, c in enumerate(z0):
+        result[i] += c
+        result[i + m] -= c
+    for i, c in enumerate(z2):
+        result[i + 2 * m] += c
+        result[i + m] -= c
+    for i, c in enumerate(z1):
+        result[i + m] += c
+    return result[:len(a) + len(b) - 1]
+
+def _add_low(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    return [x + y for x, y in zip(a, b)] + a[len(b):]
+
+def kronecker_mul(a, b):
+    """Product of polynomials with int or Fraction coefficients by Kronecker substitution.
+
+    Both are scaled to integer polynomials, evaluated at x = 2**k with k large enough to hold any
+    product coefficient, multiplied as two big integers and the product read back k bits at a time.
+    """
+    a, b = trim(a), trim(b)
+    if not a or not b:
+        return []
+    content_a, a = integer_primitive(a)
+    content_b, b = integer_primitive(b)
+
+    bound = min(len(a), len(b)) * max(map(abs, a)) * max(map(abs, b))
+    size = (bound.bit_length() + 2 + 7) // 8 # bytes per coefficient, with room for the sign
+    half = 1 << (8 * size - 1)
+    length = len(a) + len(b) - 1
+
+    product = _kronecker_value(a, size) * _kronecker_value(b, size)
+    # offset every coefficient by half so that each k-bit digit is non-negative
+    digits = (product + int.from_bytes(half.to_bytes(size, "big") * length, "big")).to_bytes(size * length, "big")
+    result = [int.from_bytes(digits[i:i + size], "big") - half for i in range(0, size * length, size)]
+
+    c = content_a * content_b
+    if c.denominator == 1:
+        c = c.numerator
+        return trim([x * c for x in result]) if c != 1 else result
+    return trim([x * c for x in result])
+
+def _kronecker_value(a, size):
+    """a(2**(8*size)) for an integer polynomial a"""
+    positive = b"".join((c if c > 0 else 0).to_bytes(size, "big") for c in a)
+    negative = b"".join((-c if c < 0 else 0).to_bytes(size, "big") for c in a)
+    return int.from_bytes(positive, "big") - int.from_bytes(negative, "big")
+
+def divide(a, b):
+    """Quotient and remainder of a / b, generalizing synthetic_division to any divisor.
+
+    int and Fraction coefficients are divided fraction-free in the integers (see _rational_divide) and
+    the results returned as Fractions.
+    """
+    a, b = trim(a), trim(b)
+    if not b:
+        raise ZeroDivisionError("polynomial division by zero")
+    if len(a) < len(b):
+        return ([], a)
+    if len(b) > 1 and _rational(a) and _rational(b):
+        return _rational_divide(a, b)
+
+    lead = Fraction(b[0]) if isinstance(b[0], int) else b[0]
+    remainder = list(a)
+    quotient = []
+    for i in range(len(a) - len(b) + 1):
+        c = remainder[i] / lead
+        quotient.append(c)
+        if c:
+            for j in range(1, len(b)):
+                remainder[i + j] -= c * b[j]
+    return (trim(quotient), trim(remainder[len(a) - len(b) + 1:]))
+
+def _rational_divide(a, b):
+    """divide() for int and Fraction coefficients by pseudo-division of their primitive integer polynomials.
+
+    Before step i the remainder coefficients in reach of b are lc(b)**i times their true value, so
+    every step is integer arithmetic and a coefficient of a only gets its power of lc(b) when b
+    first reaches it. Fractions are built once for each result coefficient.
+    """
+    content_a, a = integer_primitive(a)
+    content_b, b = integer_primitive(b)
+    m, steps = len(b) - 1, len(a) - len(b) + 1
+    lead, tail = b[0], b[1:]
+    remainder = a
+    quotient = []
+    power = 1 # lead**i
+    for i in range(steps):
+        remainder[i + m] *= power
+        c = remainder[i]
+        quotient.append(c)
+        window = remainder[i + 1:i + m + 1]
+        if c:
+            remainder[i + 1:i + m + 1] = [lead * x - c * y for x, y in zip(window, tail)]
+        else:
+            remainder[i + 1:i + m + 1] = [lead * x for x in window]
+        power *= lead
+    scale = content_a / content_b
+    power = 1
+    for i, c in enumerate(quotient):
+        power *= lead
+        quotient[i] = scale * Fraction(c, power)
+    # power is lead**steps again, the scale of the remainder
+    return (trim(quotient), trim([content_a * Fraction(c, power) for c in remainder[steps:]]))
+
+def exact_divide(a, b):
+    """Quotient of integer polynomials a / b, or None if b doesn't divide a over the integers"""
+    a, b = trim(a), trim(b)
+    if len(a) < len(b):
+        return [] if not a else None
+
+    lead = b[0]
+    remainder = list(a)
+    quotient = []
+    for i in range(len(a) - len(b) + 1):
+        c, r = divmod(remainder[i], lead)
+        if r:
+            return None
+        quotient.append(c)
+        if c:
+            for j in range(1, len(b)):
+                remainder[i + j] -= c * b[j]
+    return quotient if not any(remainder[len(a) - len(b) + 1:]) else None
+
+def derivative(a):
+    n = len(a) - 1
+    return trim([c * (n - i) for i, c in enumerate(a[:-1])])
+
+def content(a):
+    """Greatest common divisor of the integer coefficients, carrying the sign of the leading one"""
+    g = reduce(math.gcd, a, 0)
+    return -g if a and a[0] < 0 else g
+
+def primitive(a):
+    """Integer polynomial divided by its content, so the coefficients are coprime and the leading one positive"""
+    g = content(a)
+    return [c // g for c in a] if g else []
+
+def integer_primitive(a):
+    """Scale rational coefficients to a primitive integer polynomial, returning (content, primitive)"""
+    a = trim(a)
+    if not a:
+        return (Fraction(0), [])
+    scale_ = reduce(math.lcm, (Fraction(c).denominator for c in a), 1)
+    integers = [int(c * scale_) for c in a]
+    g = content(integers)
+    return (Fraction(g, scale_), [c // g for c in integers])
+
+def pseudo_remainder(a, b):
+    """Remainder of lc(b)**(deg a - deg b + 1) * a divided by b, which stays in the integers for integer a and b"""
+    a, b = trim(a), trim(b)
+    if len(a) < len(b):
+        return a
+    r = list(a)
+    lead = b[0]
+    for i in range(len(a) - len(b) + 1):
+        c = r[i]
+        for j in range(i + 1, len(r)):
+            r[j] *= lead
+        if c:
+            for j in range(1, len(b)):
+                r[i + j] -= c * b[j]
+    return trim(r[len(a) - len(b) + 1:])
+
+def gcd(a, b):
+    """Greatest common divisor of two integer polynomials as a primitive polynomial, by subresultant remainder sequence.
+
+    Dividing each pseudo-remainder by the known factor g*h**delta keeps the coefficients as small as in
+    the primitive sequence without a content computation per step.
+    """
+    a, b = trim(a), trim(b)
+    if not a or not b:
+        return primitive(a or b)
+    if len(a) < len(b):
+        a, b = b, a
+    a, b = primitive(a), primitive(b)
+    g = h = 1
+    while True:
+        delta = len(a) - len(b)
+        r = pseudo_remainder(a, b)
+        if not r:
+            return primitive(b)
+        if len(r) == 1:
+            return [1]
+        divisor = g * h**delta
+        a, b = b, [c // divisor for c in r]
+        g = a[0]
+        h = g**delta // h**(delta - 1) if delta else h
+
+def squarefree_decomposition(a):
+    """Yun's square-free decomposition of an integer polynomial.
+
+    Returns [(g, multiplicity), ...] with increasing multiplicities, where the g are primitive, square-free,
+    pairwise coprime and primitive(a) is the product of g**multiplicity.
+    """
+    a = primitive(trim(a))
+    if len(a) <= 1:
+        return []
+    d = derivative(a)
+    g = gcd(a, d)
+    b, c = exact_divide(a, g), exact_divide(d, g)
+    result = []
+    multiplicity = 1
+    while len(b) > 1:
+        d = sub(c, derivative(b))
+        g = gcd(b, d)
+        if len(g) > 1:
+            result.append((g, multiplicity))
+        b, c = exact_divide(b, g), exact_divide(d, g)
+        multiplicity += 1
+    return result
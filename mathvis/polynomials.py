@@ -2,50 +2,46 @@
 
 import argparse
 import math
-import numpy
-import matplotlib.pyplot as plt
+import sys
+from collections import OrderedDict
 from fractions import Fraction
 from functools import reduce
+import instrumentation
+import isolation
+import polyarith
+import precision
+import surds
+import zassenhaus
 from cfractions import CFraction
-from itertools import chain, combinations
-from operator import mul
+from primes import factorize
+from numbers import Complex, Real
 
 description = """
 Factors quadratics from (ax^2 + bx + c) to (px + q)(rx + s).
-Also can factor higher order polynomials with no more than 2 irrational or complex roots
+Higher order polynomials are factored into linear factors for their rational roots and
+irreducible factors over the integers for the rest
 """
 
 display_max_denominator = 9999
 display_max_precision = 4
 display_force_exact = False
+view_resolution = Fraction(1, 16) # width root intervals are refined to when choosing the plot x range
 
 def prime_factor(num):
-    factors = []
-    if num == 0:
-        return factors
-    n = abs(num)
-    while n % 2 == 0:
-        factors.append(2)
-        n //= 2
-
-    i = 3
-    while i**2 <= n:
-        while n % i == 0:
-            factors.append(i)
-            n //= i
-        i += 2
-
-    if n > 2:
-        factors.append(n)
-
-    return factors
+    "prime_factor(-360) --> [2, 2, 2, 3, 3, 5]"
+    return [prime for prime, multiplicity in factorize(num).items() for _ in range(multiplicity)]
 
-def powerset(iterable):
-    "powerset([1,2,3]) --> () (1,) (2,) (3,) (1,2) (1,3) (2,3) (1,2,3)"
-    s = list(iterable)
-    return chain.from_iterable(combinations(s, r) for r in range(len(s)+1))
+def divisors(num):
+    "divisors(12) --> [1, 2, 3, 4, 6, 12], built from the multiplicity of each prime factor"
+    result = [1]
+    for prime, multiplicity in factorize(num).items():
+        result = [d * prime**k for d in result for k in range(multiplicity + 1)]
+    return sorted(result)
 
 def synthetic_division(polynomial, root):
+    policy = precision.current()
+    if policy.mode != "exact":
+        return _synthetic_division_limited(polynomial, root, policy)
     result = polynomial[0]
     coefficients = [result]
     for c in polynomial[1:]:
@@ -53,54 +49,381 @@ def synthetic_division(polynomial, root):
         coefficients.append(result)
     return (result, coefficients[:len(coefficients)-1])
 
+def _denominator(value):
+    """Denominator of an exact value, the shared one for a CFraction and 1 for anything else"""
+    if type(value) is CFraction:
+        return value._d
+    return getattr(value, "denominator", 1)
+
+def _inexact(value):
+    return complex(value) if _is_complex(value) else float(value)
+
+def _synthetic_division_limited(polynomial, root, policy):
+    """synthetic_division under a bounded or float precision policy"""
+    root = policy.limit(root)
+    result = policy.limit(polynomial[0])
+    coefficients = [result]
+    for c in polynomial[1:]:
+        if policy.falls_back(max(_denominator(result), _denominator(root))):
+            # finish in floating point from here on
+            result, root = _inexact(result), _inexact(root)
+            for c in polynomial[len(coefficients):]:
+                result = result * root + _inexact(c)
+                coefficients.append(result)
+            break
+        result = policy.limit(result * root + c)
+        coefficients.append(result)
+    return (result, coefficients[:len(coefficients)-1])
+
+def _candidate_intervals(coefficients):
+    """Isolating intervals of the real roots of a square-free integer polynomial as closed integer bounds (ln, ld, hn, hd).
+
+    Each interval is narrowed to 1/lc**2, the smallest gap between two rational root candidates, so
+    it holds at most a couple of candidates for each denominator.
+    """
+    return [(low.numerator, low.denominator, high.numerator, high.denominator)
+            for low, high in isolation.real_root_intervals(coefficients, Fraction(1, coefficients[0]**2))]
+
+def _interval_candidates(intervals, leading, constant, linear):
+    """(interval index, p, q) for the rational root candidates p/q in lowest terms inside the intervals.
+
+    q divides the leading coefficient and p the constant, or the linear coefficient when the constant
+    is 0 and x itself is a factor (0 is then a candidate too).
+    """
+    divisor = constant or linear
+    candidates = []
+    for index, (ln, ld, hn, hd) in enumerate(intervals):
+        for q in divisors(leading):
+            for p in range(-(-ln * q // ld), hn * q // hd + 1):
+                if p == 0:
+                    if constant == 0 and q == 1:
+                        candidates.append((index, 0, 1))
+                elif divisor % p == 0 and math.gcd(p, q) == 1:
+                    candidates.append((index, p, q))
+    return candidates
+
+def integer_horner(coefficients, p, q):
+    """q**n * f(p/q) for integer coefficients of degree n, so rational candidates are tested without Fractions"""
+    result = coefficients[0]
+    power = 1
+    for c in coefficients[1:]:
+        power *= q
+        result = result * p + c * power
+    return result
+
+def _integer_form(coefficients):
+    """(content, primitive) with coefficients = content * primitive, the primitive integers coprime and the first nonzero one positive"""
+    policy = precision.current()
+    values = [policy.limit(Fraction(c)) for c in coefficients]
+    scale = reduce(math.lcm, (v.denominator for v in values), 1)
+    integers = [v.numerator * (scale // v.denominator) for v in values]
+    g = reduce(math.gcd, integers, 0)
+    if g == 0:
+        return (Fraction(0), integers)
+    if next(c for c in integers if c) < 0:
+        g = -g
+    return (Fraction(g, scale), [c // g for c in integers])
+
+def horner(coefficients, x, dtype=None, exact=None):
+    """Evaluate the polynomial with coefficients in order of decreasing power at x using Horner's scheme.
+
+    ndarray input takes a vectorized fast path in 'dtype' (float64, or complex128 if any coefficient is
+    complex) and scalar, list or tuple input is evaluated exactly with Fraction/CFraction arithmetic.
+    Pass exact=True or exact=False (or an explicit dtype) to override the choice.
+    """
+    # an ndarray means numpy is already imported, don't import it just to check
+    numpy = sys.modules.get("numpy")
+    is_array = numpy is not None and isinstance(x, numpy.ndarray)
+    if exact is None:
+        exact = dtype is None and not is_array
+    elif exact and dtype is not None:
+        raise ValueError("dtype can't be combined with exact evaluation")
+
+    if not exact:
+        import numpy
+        if dtype is None:
+            dtype = numpy.complex128 if any(_is_complex(c) for c in coefficients) else numpy.float64
+        x = numpy.asarray(x, dtype=dtype)
+        coefficients = [dtype(c) for c in coefficients]
+        result = numpy.full(x.shape, coefficients[0], dtype=dtype)
+        for c in coefficients[1:]:
+            result *= x
+            result += c
+        return result if result.ndim else result[()]
+
+    if is_array:
+        return numpy.array([_horner_exact(coefficients, v) for v in x.ravel()], dtype=object).reshape(x.shape)
+    if isinstance(x, (list, tuple)):
+        return [_horner_exact(coefficients, v) for v in x]
+    return _horner_exact(coefficients, x)
+
+def _is_complex(value):
+    return isinstance(value, Complex) and not isinstance(value, Real)
+
+def _horner_exact(coefficients, x):
+    # floats are converted exactly, exact types (Fraction, CFraction, Surd, ...) are used as they are
+    if isinstance(x, float):
+        x = Fraction(x)
+    elif isinstance(x, complex):
+        x = CFraction(x)
+    policy = precision.current()
+    if policy.mode != "exact":
+        return _synthetic_division_limited(coefficients, x, policy)[0]
+    result = coefficients[0]
+    for c in coefficients[1:]:
+        result = result * x + c
+    return result
+
 class Polynomial():
     def __init__(self, *coefficients):
         self.degree = len(coefficients) - 1
-        self.coefficients = [Fraction(a) for a in coefficients]
+        # kept as content * primitive integer polynomial, Fraction coefficients are only built on request
+        self.content, self.primitive = _integer_form(coefficients)
+        self._coefficients = None
         self.factor_sets = []
+        self.multiplicity_sets = []
 
-    def factor(self, verbose=False):
-        coef = self.coefficients
-        factor_set = []
-        while len(coef) > 3:
-            possible_num = sorted([Fraction(reduce(mul, num, 1)) for num in list(set(powerset(prime_factor(coef[-1]))))])
-            possible_den = sorted([Fraction(reduce(mul, den, 1)) for den in list(set(powerset(prime_factor(coef[0]))))])
-            print(possible_den)
-            possible_roots = [a * num / den for a in (1, -1) for den in possible_den for num in possible_num]
-            possible_roots.append(0)
-            root = None
-            quotient = None
-            for r in possible_roots:
-                print("Testing root ", r)
-                result = synthetic_division(coef, r)
-                if result[0] == 0:
-                    root = r
-                    quotient = result[1]
-                    break
-            else:
-                print("No rational roots found")
-                break
+    @property
+    def coefficients(self):
+        """Coefficients as Fractions, in order of decreasing power"""
+        if self._coefficients is None:
+            self._coefficients = [self.content * c for c in self.primitive]
+        return self._coefficients
 
-            factor_set.append(Line(1, -1*root))
-            coef = quotient
-            if verbose:
-                print("Found factor %s" % factor_set[-1])
-                print("Quotient is %s" % quotient)
+    def __str__(self):
+        terms = []
+        for i, c in enumerate(self.coefficients):
+            if c == 0:
+                continue
+            power = self.degree - i
+            c_disp = (c if display_force_exact or c.denominator <= display_max_denominator else round(float(c), display_max_precision))
+            variable = "" if power == 0 else ("x" if power == 1 else "x^%d" % power)
+            term = ("%s%s" % ("" if abs(c_disp) == 1 and power > 0 else abs(c_disp), variable))
+            if not terms:
+                terms.append(("-" if c_disp < 0 else "") + term)
+            else:
+                terms.append((" - " if c_disp < 0 else " + ") + term)
+        return "".join(terms) if terms else "0"
+
+    @classmethod
+    def _from_list(cls, coefficients):
+        """Polynomial from a polyarith coefficient list, where the zero polynomial is []"""
+        return cls(*(coefficients or [0]))
+
+    @classmethod
+    def from_factors(cls, *factors):
+        """Product of Polynomials, Quadratics, Lines, FactorPairs, factor sets and constants, e.g. to check a factorization"""
+        product = reduce(polyarith.mul, (_coefficient_list(factor) for factor in factors), [1])
+        # conjugate complex factors multiply out to real coefficients
+        return cls._from_list([c.real if isinstance(c, CFraction) and c.imag == 0 else c for c in product])
+
+    def terms(self):
+        """Coefficients without leading zeros, [] for the zero polynomial"""
+        return polyarith.trim(self.coefficients)
+
+# Arithmetic
+    def __eq__(self, other):
+        b = _coefficient_list(other, strict=True)
+        return NotImplemented if b is None else self.terms() == b
 
-        if len(coef) == 3:
-            factor_set.append(Quadratic(*coef).factor(1))
-        self.factor_sets.append(factor_set)
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash(tuple(self.terms()))
+
+    def __neg__(self):
+        return Polynomial._from_list([-c for c in self.terms()])
+
+    def __pos__(self):
+        return self
+
+    def __add__(self, other):
+        b = _coefficient_list(other, strict=True)
+        return NotImplemented if b is None else Polynomial._from_list(polyarith.add(self.terms(), b))
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        b = _coefficient_list(other, strict=True)
+        return NotImplemented if b is None else Polynomial._from_list(polyarith.sub(self.terms(), b))
+
+    def __rsub__(self, other):
+        b = _coefficient_list(other, strict=True)
+        return NotImplemented if b is None else Polynomial._from_list(polyarith.sub(b, self.terms()))
+
+    def __mul__(self, other):
+        b = _coefficient_list(other, strict=True)
+        return NotImplemented if b is None else Polynomial._from_list(polyarith.mul(self.terms(), b))
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __divmod__(self, other):
+        b = _coefficient_list(other, strict=True)
+        if b is None:
+            return NotImplemented
+        a = self.terms()
+        if len(b) == 2 and b[0] == 1 and len(a) >= 2: # x - r, deflate by synthetic division
+            remainder, quotient = synthetic_division(a, -b[1])
+            return (Polynomial._from_list(quotient), Polynomial._from_list([remainder] if remainder else []))
+        quotient, remainder = polyarith.divide(a, b)
+        return (Polynomial._from_list(quotient), Polynomial._from_list(remainder))
+
+    def __floordiv__(self, other):
+        result = self.__divmod__(other)
+        return result if result is NotImplemented else result[0]
+
+    def __mod__(self, other):
+        result = self.__divmod__(other)
+        return result if result is NotImplemented else result[1]
+
+    def __pow__(self, power):
+        if not isinstance(power, int) or power < 0:
+            raise ValueError("polynomials can only be raised to non-negative integer powers")
+        result, base = [1], self.terms()
+        while power:
+            if power & 1:
+                result = polyarith.mul(result, base)
+            power >>= 1
+            if power:
+                base = polyarith.mul(base, base)
+        return Polynomial._from_list(result)
+
+    def compose(self, other):
+        """self(other(x)) for a polynomial or constant 'other', by Horner's scheme"""
+        inner = _coefficient_list(other, strict=True)
+        if inner is None:
+            raise TypeError("can't compose a polynomial with {}".format(type(other).__name__))
+        result = []
+        for c in self.terms():
+            result = polyarith.add(polyarith.mul(result, inner), [c] if c else [])
+        return Polynomial._from_list(result)
+
+    def derivative(self):
+        return Polynomial._from_list(polyarith.derivative(self.terms()))
+
+# Methods
+    def factor(self, verbose=False):
+        """Factor into linear factors for the rational roots and irreducibles for the rest, appended to factor_sets.
+
+        A square-free decomposition runs first, so each distinct factor is searched for once. factor_sets
+        gets every factor repeated by its multiplicity and multiplicity_sets the (factor, multiplicity) pairs.
+        Returns an instrumentation.FactorStats of the run.
+        """
+        stats = instrumentation.FactorStats()
+        with stats.timer("factor"):
+            with stats.timer("squarefree"):
+                parts = polyarith.squarefree_decomposition(self.primitive)
+            stats.count("squarefree_parts", len(parts))
+
+            content = self.content
+            factor_set = []
+            multiplicities = []
+            for part, multiplicity in parts:
+                # keep the content in a simple factor, so a square-free f is factored as it is
+                scale = content if multiplicity == 1 else 1
+                if multiplicity == 1:
+                    content = 1
+                for factor in self._factor_squarefree(part, scale, stats, verbose):
+                    multiplicities.append((factor, multiplicity))
+                    factor_set.extend([factor] * multiplicity)
+            if content != 1:
+                multiplicities.insert(0, (Polynomial(content), 1))
+                factor_set.insert(0, Polynomial(content))
+            self.factor_sets.append(factor_set)
+            self.multiplicity_sets.append(multiplicities)
+        return stats
+
+    def _factor_squarefree(self, coef, scale, stats, verbose=False):
+        """Factors of scale * the square-free integer polynomial 'coef', by rational root search and Zassenhaus.
+
+        The real roots are isolated first and only candidates p/q inside an isolating interval are formed.
+        They are tested with integer Horner on q**n * f(p/q) and a root is divided out as (qx - p) over
+        the integers, with q moved into 'scale' so the factor can stay the monic (x - p/q).
+        """
+        tracing = instrumentation.hooks_active()
+        factors = []
+        if len(coef) > 3:
+            with stats.timer("isolation"):
+                intervals = _candidate_intervals(coef)
+            # candidates of f cover the rational roots of every quotient of f, so one pass is enough
+            with stats.timer("candidates"):
+                candidates = _interval_candidates(intervals, coef[0], coef[-1], coef[-2])
+            stats.count("candidates_generated", len(candidates))
+
+            found = set() # intervals whose root was divided out
+            tested = skipped = 0
+            with stats.timer("deflation"):
+                for index, p, q in candidates:
+                    if len(coef) <= 3:
+                        break
+                    if index in found:
+                        skipped += 1
+                        continue
+                    tested += 1
+                    is_root = integer_horner(coef, p, q) == 0
+                    if tracing:
+                        instrumentation.emit("candidate", root=Fraction(p, q), is_root=is_root)
+                    if not is_root:
+                        continue
+                    coef = polyarith.exact_divide(coef, [q, -p])
+                    scale *= q
+                    found.add(index)
+                    stats.count("synthetic_divisions")
+                    stats.count("roots_found")
+                    factors.append(Line(1, -Fraction(p, q)))
+                    if verbose:
+                        print("Found factor %s" % factors[-1])
+                        print("Quotient is %s" % [scale * c for c in coef])
+            stats.count("candidates_tested", tested)
+            stats.count("candidates_skipped", skipped)
+            if verbose and not found:
+                print("No rational roots found")
 
-    def evaluate(self, x):
-        return sum(self.coefficients[self.degree-i]*x**i for i in range(self.degree, -1, -1))
+        coef = [scale * c for c in coef]
+        if len(coef) == 2:
+            factors.append(Line(*coef))
+        elif len(coef) == 3:
+            with stats.timer("quadratic"):
+                factors.append(Quadratic(*coef).factor(1))
+        elif len(coef) > 3:
+            # no rational roots left, split the rest into irreducible factors over the integers
+            with stats.timer("irreducible"):
+                content, primitive = polyarith.integer_primitive(coef)
+                integer_content, irreducibles = zassenhaus.factor(primitive)
+                # the first irreducible carries the content, so the factors multiply back to scale * coef
+                content *= integer_content
+                for irreducible, _ in irreducibles:
+                    irreducible = [content * c for c in irreducible]
+                    content = 1
+                    factors.append(Quadratic(*irreducible).factor(1) if len(irreducible) == 3 else Polynomial(*irreducible))
+        return factors
 
-    def plot(self, low, high):
-        x = numpy.linspace(low, high, (high - low) * 10)
-        y = self.evaluate(x)
+    def evaluate(self, x, dtype=None, exact=None):
+        return horner(self.coefficients, x, dtype, exact)
+
+    def real_root_intervals(self, width=None):
+        """Sorted intervals (low, high] each holding one distinct real root, (x, x) for a root x hit exactly"""
+        return isolation.real_root_intervals(self.primitive, width)
+
+    def view_xrange(self):
+        """x range showing the real roots and turning points, (-10, 10) if there are none"""
+        turning = isolation.real_root_intervals(polyarith.derivative(polyarith.trim(self.primitive)), view_resolution)
+        return isolation.view_range(self.real_root_intervals(view_resolution) + turning)
+
+    def plot(self, low=None, high=None, pixel_width=800):
+        import matplotlib.pyplot as plt
+        import sampling
+        if low is None or high is None:
+            low, high = self.view_xrange()
+        roots = [-factor.b / factor.a for factor in (self.factor_sets[0] if self.factor_sets else []) if isinstance(factor, Line)]
+        x, y = sampling.adaptive_sample(self.evaluate, low, high, roots, pixel_width=pixel_width)
         fig, ax = plt.subplots()
         ax.plot(x, y)
-        axis_y = numpy.linspace(0, 0, len(x))
-        ax.plot(x, axis_y)
+        ax.plot([x[0], x[-1]], [0, 0])
         plt.show()
 
 class Line():
@@ -125,8 +448,8 @@ class Line():
             return "({}x + {})".format("" if self.a == 1 else ("-" if self.a == -1 else (self.a if display_force_exact or self.a.denominator <= display_max_denominator else round(float(self.a), display_max_precision))),
                                        format_cfraction(self.b))
 
-    def evaluate(self, x):
-        return self.a*x + self.b
+    def evaluate(self, x, dtype=None, exact=None):
+        return horner((self.a, self.b), x, dtype, exact)
 
 class FactorPair():
     def __init__(self, p=0, q=0, r=0, s=0, b1=None, b2=None):
@@ -163,9 +486,103 @@ class FactorPair():
     def expand(self):
         return Quadratic(self.p*self.r, self.p*self.s + self.q*self.r, self.q*self.s)
 
+class FactorFamily():
+    """Factor pairs (px + q)(rx + s) of a Quadratic for p in start, start + step, ... up to stop (exclusive), skipping p = 0.
+
+    Indexing builds the exact FactorPair for that p lazily, keeping the 'cache_size' most recently used ones.
+    The p, q, r and s float64 arrays (q and s complex128 for complex roots) for the whole range are
+    computed in one numpy pass the first time they or evaluate() are used.
+    """
+
+    def __init__(self, quadratic, start, stop, step=1, cache_size=256):
+        start, stop, step = Fraction(start), Fraction(stop), Fraction(step)
+        if step == 0:
+            raise ValueError("factor range step must not be zero")
+
+        # p = numerators / denominator, kept exact as integers over a common denominator
+        count = max(0, math.ceil((stop - start) / step))
+        self.denominator = math.lcm(start.denominator, step.denominator)
+        first = start.numerator * (self.denominator // start.denominator)
+        increment = step.numerator * (self.denominator // step.denominator)
+        self._numerators = range(first, first + count * increment, increment) if count else range(0)
+        self._zero = self._numerators.index(0) if 0 in self._numerators else len(self._numerators)
+
+        self.quadratic = quadratic
+        self.cache_size = cache_size
+        self._pairs = OrderedDict()
+        self._arrays = None
+
+    def numerator(self, index):
+        """Numerator of p for the nonzero p at 'index'"""
+        index = range(len(self))[index]
+        return self._numerators[index if index < self._zero else index + 1]
+
+    def arrays(self):
+        """(p, q, r, s) as float arrays over the whole range"""
+        if self._arrays is None:
+            import numpy
+            quadratic = self.quadratic
+            numerators = self._numerators
+            bound = max(abs(numerators.start), abs(numerators.start + len(numerators) * numerators.step))
+            numerators = numpy.arange(len(numerators), dtype=numpy.int64 if bound < 2**62 else object) * numerators.step + numerators.start
+            numerators = numerators[numerators != 0]
+
+            a, b, c = float(quadratic.a), float(quadratic.b), float(quadratic.c)
+            radical = complex(quadratic.radical) if isinstance(quadratic.radical, CFraction) else float(quadratic.radical)
+            p = numerators.astype(numpy.float64) / self.denominator
+            if quadratic.a == 0: # linear function
+                self._arrays = (p, numpy.zeros_like(p), c * p / b, b / p)
+            else: # quadratic function
+                self._arrays = (p, (b - radical) * p / (2 * a), a / p, (b + radical) / (2 * p))
+        return self._arrays
+
+    @property
+    def p(self):
+        return self.arrays()[0]
+
+    @property
+    def q(self):
+        return self.arrays()[1]
+
+    @property
+    def r(self):
+        return self.arrays()[2]
+
+    @property
+    def s(self):
+        return self.arrays()[3]
+
+    def __len__(self):
+        return len(self._numerators) - (self._zero < len(self._numerators))
+
+    def __getitem__(self, index):
+        index = range(len(self))[index]
+        pair = self._pairs.get(index)
+        if pair is None:
+            pair = self.quadratic._factor_pair(Fraction(self.numerator(index), self.denominator))
+            self._pairs[index] = pair
+            if len(self._pairs) > self.cache_size:
+                self._pairs.popitem(last=False)
+        else:
+            self._pairs.move_to_end(index)
+        return pair
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def evaluate(self, x):
+        """Every factor line at x in one broadcast, shaped (len(self), 2) + x.shape with [:, 0] = px + q and [:, 1] = rx + s"""
+        import numpy
+        p, q, r, s = self.arrays()
+        x = numpy.asarray(x, dtype=numpy.float64)
+        shape = (-1,) + (1,) * x.ndim
+        return numpy.stack((p.reshape(shape) * x + q.reshape(shape),
+                            r.reshape(shape) * x + s.reshape(shape)), axis=1)
+
 class Quadratic():
     def __init__(self, a, b, c):
         self.factor_pairs = {}
+        self.factor_families = []
         self.a = Fraction(a)
         self.b = Fraction(b)
         self.c = Fraction(c)
@@ -180,20 +597,24 @@ class Quadratic():
         term3 = ("" if self.c == 0 else ((" + %s" % c_disp) if c_disp > 0 else " - %s" % (-1 * c_disp)))
         return term1 + term2 + term3
 
-    def evaluate(self, x):
-        return self.a*(x**2) + self.b*x + self.c
+    def evaluate(self, x, dtype=None, exact=None):
+        return horner((self.a, self.b, self.c), x, dtype, exact)
 
     def find_roots(self):
         roots = []
         discriminant = Fraction(self.b**2 - (4 * self.a * self.c))
         if discriminant < 0: # complex solutions
-            self.radical = CFraction(0, math.sqrt(-1 * discriminant))
+            radical = surds.sqrt(-1 * discriminant)
+            # CFraction components are Fractions, so only a rational imaginary radical can stay exact
+            self.radical = CFraction(0, radical if isinstance(radical, Fraction) else math.sqrt(-1 * discriminant))
             roots.append((-1 * self.b + self.radical) / (2 * self.a))
             roots.append((-1 * self.b - self.radical) / (2 * self.a))
         else:
-            self.radical = Fraction(math.sqrt(discriminant))
+            self.radical = surds.sqrt(discriminant) # Fraction for rational squares, Surd otherwise
             if self.a == 0: # linear function
                 roots.append(-1 * self.c / self.b)
+            elif discriminant == 0: # repeated root
+                roots.append(-1 * self.b / (2 * self.a))
             else: # quadratic function
                 roots.append((-1 * self.b + self.radical) / (2 * self.a))
                 roots.append((-1 * self.b - self.radical) / (2 * self.a))
@@ -210,40 +631,87 @@ class Quadratic():
         if p in self.factor_pairs:
             return self.factor_pairs[p]
 
+        p = Fraction(p)
+        pair = self._factor_pair(p)
+        if verbose:
+            print("a=pr:      %s" % (self.a == pair.p*pair.r))
+            print("b=(qr+ps): %s" % (self.b == (pair.q*pair.r + pair.p*pair.s)))
+            print("c=qs:      %s" % (self.c == pair.q*pair.s))
+
+        self.factor_pairs[p] = pair
+        return pair
+
+    def _factor_pair(self, p):
+        """FactorPair for the nonzero Fraction p, without caching"""
         if self.a == 0: # linear function
-            p = Fraction(p)
             r = self.c * p / self.b
             q = 0
             s = self.b / p
         else: # quadratic function
-            p = Fraction(p)
             r = self.a / p
             q = (self.b - self.radical) / (2 * r)
             s = (self.b + self.radical) / (2 * p)
-
-        if verbose:
-            print("a=pr:      %s" % (self.a == p*r))
-            print("b=(qr+ps): %s" % (self.b == (q*r + p*s)))
-            print("c=qs:      %s" % (self.c == q*s))
-
-        self.factor_pairs[p] = FactorPair(p, q, r, s)
-        return self.factor_pairs[p]
-
-    def plot(self, low, high):
-        x = numpy.linspace(low, high, (high - low) * 10)
-        y = self.evaluate(x)
+        return FactorPair(p, q, r, s)
+
+    def factor_range(self, start, stop, step=1, cache_size=256):
+        """Factor pairs for every nonzero p in start, start + step, ... < stop as a FactorFamily"""
+        family = FactorFamily(self, start, stop, step, cache_size)
+        self.factor_families.append(family)
+        return family
+
+    def view_xrange(self):
+        """x range showing the real roots and the vertex (the root of a linear function)"""
+        intervals = isolation.real_root_intervals([self.a, self.b, self.c], view_resolution)
+        if self.a != 0:
+            vertex = -self.b / (2 * self.a)
+            intervals.append((vertex, vertex))
+        return isolation.view_range(intervals)
+
+    def plot(self, low=None, high=None, pixel_width=800):
+        import matplotlib.pyplot as plt
+        import numpy
+        import sampling
+        if low is None or high is None:
+            low, high = self.view_xrange()
+        x, y = sampling.adaptive_sample(self.evaluate, low, high, self.roots, pixel_width=pixel_width)
         fig, ax = plt.subplots()
         ax.plot(x, y)
-        axis_y = numpy.linspace(0, 0, len(x))
-        ax.plot(x, axis_y)
+        ax.plot([x[0], x[-1]], [0, 0])
 
+        # factor lines are straight, so their end points are enough
+        ends = numpy.array([x[0], x[-1]])
         for pair in self.factor_pairs.values():
             for line in pair.binomials:
-                y = line.evaluate(x)
-                ax.plot(x, y)
+                ax.plot(ends, line.evaluate(ends))
+        for family in self.factor_families:
+            ax.plot(ends, family.evaluate(ends).reshape(-1, 2).T.real)
 
         plt.show()
 
+def _coefficient_list(value, strict=False):
+    """polyarith coefficient list of a polynomial-like value or a constant.
+
+    Factor sets (lists/tuples of factors) are multiplied out unless strict, in which case anything
+    other than a Polynomial or rational number gives None.
+    """
+    if isinstance(value, Polynomial):
+        return value.terms()
+    if isinstance(value, (int, Fraction)):
+        return [Fraction(value)] if value else []
+    if strict:
+        return None
+    if isinstance(value, Quadratic):
+        return polyarith.trim([value.a, value.b, value.c])
+    if isinstance(value, Line):
+        return polyarith.trim([value.a, value.b])
+    if isinstance(value, (FactorPair, list, tuple)):
+        return reduce(polyarith.mul, (_coefficient_list(factor) for factor in value), [1])
+    return [value] if value else []
+
+# Names used by window.py and the tests
+Binomial = Line
+Trinomial = Quadratic
+
 def format_cfraction(c):
     return "({} {} {}j)".format(c.real if display_force_exact or c.real.denominator <= display_max_denominator else round(float(c.real), display_max_precision),
                                 "+" if c.imag >= 0 else "-",
@@ -253,15 +721,45 @@ def main():
     global display_force_exact, display_max_precision
 
     parser = argparse.ArgumentParser(description=description)
-    parser.add_argument("coefficients", nargs="+", help="Coefficients of the polynomial, in order of decreasing power of x")
+    parser.add_argument("coefficients", nargs="*", help="Coefficients of the polynomial, in order of decreasing power of x")
     parser.add_argument("--factor", "-f", help="Coefficient p in (px + q) of factored solution")
     parser.add_argument("--exact", "-e", action="store_true", help="Always display exact coefficients")
     parser.add_argument("--precision", "-c", type=int, help="Precision of floating point coefficients")
     parser.add_argument("--plot", "-p", action="store_true", help="Show plot of polynomial and factors")
     parser.add_argument("--factor-range", "-r", nargs=2, help="Range of p in (px + q) factored solutions")
     parser.add_argument("--factor-step", "-s", help="Increment between factors in factor range")
-    parser.add_argument("--view-xrange", "-v", nargs=2, help="Segment of x-axis to display when plotting")
+    parser.add_argument("--numeric", "-n", action="store_true", help="Also print approximate roots from the numeric solver")
+    parser.add_argument("--view-xrange", "-v", nargs=2, help="Segment of x-axis to display when plotting (default: around the real roots)")
+    parser.add_argument("--batch", "-b", metavar="FILE|-", help="Analyze one polynomial per line of FILE (or stdin) and print JSON lines")
+    parser.add_argument("--serve", metavar="SOCKET|-", help="Answer JSON-line requests on the Unix socket SOCKET (or stdin/stdout) until interrupted")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes for --batch and --serve (default: number of CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Polynomials per task submitted to a worker in --batch mode")
+    parser.add_argument("--unordered", "-u", action="store_true", help="Write --batch results as they complete instead of in input order")
+    parser.add_argument("--cache", metavar="PATH", help="sqlite file persisting computed results across runs (default: $MATHVIS_CACHE)")
+    parser.add_argument("--profile", action="store_true", help="Print factoring counters and stage times (added to each JSON line with --batch)")
+    parser.add_argument("--policy", choices=precision.MODES, default="exact", help="Precision policy for long exact computations (see precision.py)")
+    parser.add_argument("--max-denominator", type=int, default=precision.default_max_denominator, help="Denominator bound of the bounded and float policies")
     args = parser.parse_args()
+    if (args.batch is not None or args.serve is not None) and (args.exact or args.precision is not None):
+        # results are formatted in worker processes and cached, neither sees the display settings
+        parser.error("--exact and --precision can't be combined with --batch or --serve")
+
+    policy = precision.configure(args.policy, args.max_denominator)
+
+    if args.cache is not None:
+        import curvecache
+        curvecache.configure(args.cache)
+
+    if args.batch is not None:
+        import batch
+        batch.run_file(args.batch, jobs=args.jobs, chunk_size=args.chunk_size, ordered=not args.unordered, profile=args.profile)
+        return
+    if args.serve is not None:
+        import server
+        server.run(args.serve, jobs=args.jobs)
+        return
+    if not args.coefficients:
+        parser.error("coefficients are required unless --batch or --serve is given")
 
     if args.exact:
         display_force_exact = True
@@ -271,8 +769,6 @@ def main():
         args.factor_range = [1, 8]
     if args.factor_step is None:
         args.factor_step = 1
-    if args.view_xrange is None:
-        args.view_xrange = [-10, 10]
 
     if len(args.coefficients) < 3:
         print("Polynomial must have at least 3 terms")
@@ -290,6 +786,7 @@ def main():
         return
 
 
+    stats = instrumentation.FactorStats()
     if type(f) is Quadratic:
         print("%s has %d root%s at:" % (f, len(f.roots), "" if len(f.roots) == 1 else "s"))
         for root in f.roots:
@@ -298,30 +795,43 @@ def main():
             else:
                 print("    x = %s" % (str(root) if display_force_exact or root.denominator <= display_max_denominator else str(round(float(root), display_max_precision))))
 
-        factors = []
-        if args.factor is not None:
-            factors.append(args.factor)
-        else:
-            for p in numpy.arange(Fraction(args.factor_range[0]), Fraction(args.factor_range[1]) + 1, Fraction(args.factor_step)):
-                factors.append(p)
-
         print("")
         if f.radical is None:
             print("%s has no factor pairs in the real space" % f)
         else:
             print("Some of the possible factorizations of %s:" % f)
-            for p in factors:
-                print(f.factor(p))
+            if args.factor is not None:
+                with stats.timer("quadratic"):
+                    pair = f.factor(args.factor)
+                print(pair)
+            else:
+                with stats.timer("quadratic"):
+                    pairs = list(f.factor_range(args.factor_range[0], Fraction(args.factor_range[1]) + 1, args.factor_step))
+                for pair in pairs:
+                    print(pair)
 
     elif type(f) is Polynomial:
         print("Analyzing degree %s polynomial" % f.degree)
-        f.factor()
+        stats = f.factor()
         for factor in f.factor_sets[0]:
-            print("%s" % factor, end="")
+            print(("(%s)" if isinstance(factor, Polynomial) else "%s") % factor, end="")
         print()
 
+    if args.numeric:
+        import rootsolver
+        coefficients = [f.a, f.b, f.c] if type(f) is Quadratic else polyarith.trim(f.coefficients)
+        print("")
+        print("Approximate roots:")
+        for root in rootsolver.to_cfractions(rootsolver.roots([coefficients]))[0]:
+            print("    x = %s" % format_cfraction(root))
+
+    if args.profile:
+        print("")
+        print(stats.summary())
+        print(policy.summary())
+
     if args.plot:
-        f.plot(Fraction(args.view_xrange[0]), Fraction(args.view_xrange[1]))
+        f.plot(*(Fraction(x) for x in args.view_xrange or ()))
 
 if __name__ == "__main__":
     main()
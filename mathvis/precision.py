@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+"""Precision policy for long Fraction and CFraction computation chains.
+
+Float values (from abs(), non-integer powers, irrational radicals) converted to fractions \
+carry denominators around 2**52, and every exact operation on them makes the denominators \
+larger. The policy decides what happens at operation boundaries in cfractions and \
+polynomials:
+
+    exact    leave every value exact (the default)
+    bounded  round results whose denominator is above max_denominator to the nearest
+             multiple of 1/max_denominator, an error of at most 1/(2 max_denominator)
+    float    keep values exact, but finish polynomial evaluation and synthetic division
+             in floating point once a denominator goes above max_denominator
+
+A policy counts its truncations and float fallbacks and keeps the largest error it \
+introduced. Use "with precision.policy('bounded', 10**6) as p:" for a block of code (the \
+setting is per thread and per asyncio task), or configure() to change the default.
+"""
+
+import contextvars
+from contextlib import contextmanager
+from fractions import Fraction
+
+MODES = ("exact", "bounded", "float")
+
+default_max_denominator = 10**6
+
+class Policy():
+    """Precision 'mode' with denominator bound 'max_denominator', recording what it truncated"""
+
+    __slots__ = ("mode", "max_denominator", "bound", "truncations", "fallbacks", "max_error")
+
+    def __init__(self, mode="exact", max_denominator=default_max_denominator):
+        if mode not in MODES:
+            raise ValueError("precision mode must be one of {}, got {!r}".format(", ".join(MODES), mode))
+        if max_denominator < 1:
+            raise ValueError("max_denominator must be at least 1, got {}".format(max_denominator))
+        self.mode = mode
+        self.max_denominator = max_denominator
+        # denominators above this are truncated, None when nothing is
+        self.bound = max_denominator if mode == "bounded" else None
+        self.reset()
+
+    def reset(self):
+        self.truncations = self.fallbacks = 0
+        self.max_error = 0.0
+
+    def limit(self, value):
+        """'value' with its denominator bounded if it is a Fraction and the mode is bounded"""
+        if self.bound is None or not isinstance(value, Fraction) or value.denominator <= self.bound:
+            return value
+        numerator, denominator = value.numerator, value.denominator
+        rounded = self.round(numerator, denominator)
+        self.record(abs(numerator * self.bound - rounded * denominator) / (denominator * self.bound))
+        return Fraction(rounded, self.bound)
+
+    def round(self, numerator, denominator):
+        """Numerator of numerator/denominator rounded to the nearest multiple of 1/bound (ties upward)"""
+        return (2 * numerator * self.bound + denominator) // (2 * denominator)
+
+    def record(self, error):
+        """Count one truncation that changed a value by 'error'"""
+        self.truncations += 1
+        if error > self.max_error:
+            self.max_error = error
+
+    def falls_back(self, denominator):
+        """True (and counted) if a chain with a value of this denominator should continue in floating point"""
+        if self.mode == "float" and denominator > self.max_denominator:
+            self.fallbacks += 1
+            return True
+        return False
+
+    def report(self):
+        return {"mode": self.mode, "max_denominator": self.max_denominator, "truncations": self.truncations,
+                "fallbacks": self.fallbacks, "max_error": self.max_error}
+
+    def summary(self):
+        """Human readable line of the mode and what it truncated"""
+        if self.mode == "exact":
+            return "precision exact"
+        return "precision %s (max denominator %d): %d truncations, %d float fallbacks, max error %.3g" % (
+            self.mode, self.max_denominator, self.truncations, self.fallbacks, self.max_error)
+
+    def __repr__(self):
+        return "Policy(%r)" % self.report()
+
+_default = Policy()
+_current = contextvars.ContextVar("mathvis_precision")
+
+def current():
+    """The policy in effect: the innermost policy() block, or the default"""
+    return _current.get(_default)
+
+def configure(mode="exact", max_denominator=default_max_denominator):
+    """Replace the default policy used outside policy() blocks and return it"""
+    global _default
+    _default = Policy(mode, max_denominator)
+    return _default
+
+@contextmanager
+def policy(mode, max_denominator=default_max_denominator):
+    """Use a new Policy for the block and yield it, so its report() can be read afterwards"""
+    active = Policy(mode, max_denominator)
+    token = _current.set(active)
+    try:
+        yield active
+    finally:
+        _current.reset(token)
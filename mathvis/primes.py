@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+"""Integer factorization for the rational root search.
+
+Small factors are removed by trial division with a sieved table of primes, what remains \
+is tested with Miller-Rabin and split with Pollard-Brent rho. Factorizations are memoized \
+in an LRU cache keyed by |n|, since Polynomial.factor asks for the same leading and \
+constant coefficients over and over.
+"""
+
+import math
+import random
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+cache_maxsize = 1024
+
+_cache = OrderedDict()
+_hits = 0
+_misses = 0
+
+def sieve(limit):
+    "sieve(20) --> [2, 3, 5, 7, 11, 13, 17, 19]"
+    if limit < 2:
+        return []
+    is_prime = bytearray([1]) * (limit + 1)
+    is_prime[0] = is_prime[1] = 0
+    for i in range(2, math.isqrt(limit) + 1):
+        if is_prime[i]:
+            is_prime[i*i::i] = bytearray(len(range(i*i, limit + 1, i)))
+    return [i for i, prime in enumerate(is_prime) if prime]
+
+_small_primes = sieve(1000)
+
+# Miller-Rabin with these bases is deterministic below 3.3 * 10**24 and a strong probable prime test above
+_witnesses = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+def is_prime(n):
+    """Miller-Rabin primality test"""
+    if n < 2:
+        return False
+    for p in _witnesses:
+        if n % p == 0:
+            return n == p
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in _witnesses:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def pollard_brent(n):
+    """Find a nontrivial factor of the odd composite n with Brent's variant of Pollard's rho"""
+    while True:
+        y, c, m = random.randrange(1, n), random.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+
+        if g == n: # the batched gcd overshot, step back one iteration at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+def _factorize(n, factors):
+    """Add the prime factors of n (free of small primes) to the 'factors' multiplicity map"""
+    if n == 1:
+        return
+    if is_prime(n):
+        factors[n] = factors.get(n, 0) + 1
+        return
+    root = math.isqrt(n)
+    if root * root == n: # squares are common in coefficients and cheap to spot
+        _factorize(root, factors)
+        _factorize(root, factors)
+        return
+    d = pollard_brent(n)
+    _factorize(d, factors)
+    _factorize(n // d, factors)
+
+def factorize(num):
+    """Return the prime factorization of |num| as a {prime: multiplicity} dict. 0 and 1 have no factors."""
+    global _hits, _misses
+
+    key = n = abs(int(num))
+    if n != abs(num):
+        raise ValueError("can only factor integers, not {}".format(num))
+
+    if key in _cache:
+        _hits += 1
+        _cache.move_to_end(key)
+        return dict(_cache[key])
+    _misses += 1
+
+    factors = {}
+    if n > 1:
+        for p in _small_primes:
+            if p * p > n:
+                break
+            if n % p == 0:
+                count = 0
+                while n % p == 0:
+                    n //= p
+                    count += 1
+                factors[p] = count
+        if n > 1 and n < (_small_primes[-1] + 2)**2: # no factor below the sieve limit means n is prime
+            factors[n] = factors.get(n, 0) + 1
+        else:
+            _factorize(n, factors)
+        factors = dict(sorted(factors.items()))
+
+    if cache_maxsize > 0:
+        _cache[key] = factors
+        while len(_cache) > cache_maxsize:
+            _cache.popitem(last=False)
+    return dict(factors)
+
+def set_cache_size(maxsize):
+    """Change the number of factorizations kept in the LRU cache, evicting the oldest if it shrinks"""
+    global cache_maxsize
+    cache_maxsize = maxsize
+    while len(_cache) > max(maxsize, 0):
+        _cache.popitem(last=False)
+
+def cache_info():
+    return CacheInfo(_hits, _misses, cache_maxsize, len(_cache))
+
+def cache_clear():
+    global _hits, _misses
+    _cache.clear()
+    _hits = _misses = 0
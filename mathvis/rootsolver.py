@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+"""Approximate roots of many polynomials at once.
+
+roots() takes a 2-D array with one polynomial per row (coefficients in order of decreasing \
+power, as everywhere in mathvis) and runs Aberth-Ehrlich or Durand-Kerner iterations on \
+every row simultaneously, so the per-iteration cost is a few numpy operations over the \
+whole batch instead of a Python loop calling numpy.roots per polynomial. Each root stops \
+moving once its correction is below the tolerance, and rows whose roots have all \
+converged drop out of the batch. An optional Newton step polishes the result.
+
+to_cfractions turns the complex128 result into CFractions with limited denominators for \
+display with polynomials.format_cfraction.
+"""
+
+import numpy
+from cfractions import CFraction
+
+METHODS = ("aberth", "durand-kerner")
+
+def initial_guesses(monic):
+    """Starting points for monic rows: spread on a circle of radius |a_n|**(1/n), the geometric mean of the root magnitudes.
+
+    The angles are offset so the points aren't symmetric about the real axis, which would keep
+    conjugate pairs from separating.
+    """
+    n = monic.shape[1] - 1
+    radius = numpy.abs(monic[:, -1]) ** (1 / n)
+    radius[radius == 0] = 1.0
+    angles = 2 * numpy.pi * numpy.arange(n) / n + 0.4
+    return radius[:, None] * numpy.exp(1j * angles)[None, :]
+
+def _evaluate(monic, z):
+    """p(z) and p'(z) for every row of monic coefficients at the points z of the same row, by Horner's scheme"""
+    p = numpy.ones_like(z)
+    dp = numpy.zeros_like(z)
+    for c in monic[:, 1:].T:
+        dp = dp * z + p
+        p = p * z + c[:, None]
+    return (p, dp)
+
+def _step(monic, z, method):
+    """Correction to subtract from every root estimate z"""
+    p, dp = _evaluate(monic, z)
+    differences = z[:, :, None] - z[:, None, :]
+    n = z.shape[1]
+    differences[:, numpy.arange(n), numpy.arange(n)] = 1
+    if method == "aberth":
+        newton = p / dp
+        repulsion = (1 / differences).sum(axis=2) - 1 # the diagonal contributed 1/1
+        return newton / (1 - newton * repulsion)
+    return p / differences.prod(axis=2)
+
+def roots(coefficients, tolerance=1e-12, max_iterations=100, polish=True, method="aberth", chunk_size=2048, full_output=False):
+    """Roots of every row of a 2-D coefficient array (n_polys x degree+1) as a complex128 array (n_polys x degree).
+
+    Leading coefficients must be nonzero. A root has converged when its last correction is at most
+    tolerance * max(1, |root|). With polish=True one Newton step follows the iteration wherever it
+    reduces |p(root)|. Rows are solved chunk_size at a time to bound the (chunk x degree x degree)
+    work arrays. With full_output=True returns (roots, converged, iterations), where converged is a
+    boolean array per polynomial and iterations the number of iterations each one took.
+    """
+    if method not in METHODS:
+        raise ValueError("method must be one of {}, got {!r}".format(", ".join(METHODS), method))
+    coefficients = numpy.asarray(coefficients, dtype=numpy.complex128)
+    if coefficients.ndim != 2 or coefficients.shape[1] < 1:
+        raise ValueError("coefficients must be a 2-D array with one polynomial per row")
+    if not numpy.all(coefficients[:, 0]):
+        raise ValueError("every polynomial needs a nonzero leading coefficient")
+
+    count, n = coefficients.shape[0], coefficients.shape[1] - 1
+    result = numpy.empty((count, n), dtype=numpy.complex128)
+    converged = numpy.ones(count, dtype=bool)
+    iterations = numpy.zeros(count, dtype=numpy.int64)
+    if n == 0:
+        return (result, converged, iterations) if full_output else result
+
+    monic = coefficients / coefficients[:, :1]
+    if n == 1:
+        result[:, 0] = -monic[:, 1]
+        return (result, converged, iterations) if full_output else result
+
+    with numpy.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for start in range(0, count, chunk_size):
+            rows = slice(start, start + chunk_size)
+            z, done, steps = _solve(monic[rows], tolerance, max_iterations, polish, method)
+            result[rows], converged[rows], iterations[rows] = z, done, steps
+    return (result, converged, iterations) if full_output else result
+
+def _solve(monic, tolerance, max_iterations, polish, method):
+    z = initial_guesses(monic)
+    settled = numpy.zeros(z.shape, dtype=bool) # per root
+    steps = numpy.zeros(len(z), dtype=numpy.int64)
+    active = numpy.arange(len(z)) # rows with a root still moving
+    for _ in range(max_iterations):
+        if not len(active):
+            break
+        rows, current = monic[active], z[active]
+        correction = _step(rows, current, method)
+        finite = numpy.isfinite(correction)
+        # a root sitting exactly on another or on a zero of p' waits for the others to move
+        correction[~finite | settled[active]] = 0
+        current = current - correction
+        z[active] = current
+        settled[active] |= finite & (numpy.abs(correction) <= tolerance * numpy.maximum(1, numpy.abs(current)))
+        steps[active] += 1
+        active = active[~settled[active].all(axis=1)]
+
+    if polish:
+        p, dp = _evaluate(monic, z)
+        polished = z - p / dp
+        # near a multiple root p/dp is mostly rounding noise, keep only steps that reduce |p|
+        better = numpy.abs(_evaluate(monic, polished)[0]) < numpy.abs(p)
+        z = numpy.where(better & numpy.isfinite(polished), polished, z)
+    return (z, settled.all(axis=1), steps)
+
+def to_cfractions(values, max_denominator=10**6):
+    """Nested lists of CFractions for an array of complex values, each component limited to max_denominator"""
+    values = numpy.asarray(values, dtype=numpy.complex128)
+    flat = [CFraction(complex(v)).limit_denominator(max_denominator) for v in values.ravel()]
+    if values.ndim == 0:
+        return flat[0]
+    return numpy.array(flat, dtype=object).reshape(values.shape).tolist()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+"""Adaptive sampling of curves for plotting.
+
+Sampling starts from a coarse uniform grid plus any known roots. Each interval is tested at \
+its midpoint, and it is split when the linear interpolation misses the curve by more than \
+the tolerance or when the curve changes sign across it. Intervals are never split below one \
+pixel of the view, and the total number of points is capped, so the cost of a plot follows \
+its width in pixels rather than the width of the x range.
+"""
+
+import numpy
+
+def adaptive_sample(f, low, high, roots=(), tolerance=1e-3, pixel_width=800, max_points=None, initial=32):
+    """Return (x, y) float arrays sampling f over [low, high] for a plot 'pixel_width' pixels wide.
+
+    f is called with float arrays and must return arrays, such as Polynomial.evaluate. Real
+    values in 'roots' inside the range are always included. tolerance is the allowed midpoint
+    error as a fraction of the sampled y range. At most max_points points are returned
+    (pixel_width + 1 plus the roots by default).
+    """
+    low, high = float(low), float(high)
+    if not low < high:
+        raise ValueError("sampling needs low < high, got {} and {}".format(low, high))
+
+    known = []
+    for root in roots:
+        try:
+            root = float(root)
+        except (TypeError, ValueError): # complex roots aren't on the curve
+            continue
+        if low < root < high:
+            known.append(root)
+    if max_points is None:
+        max_points = pixel_width + 1 + len(known)
+
+    x = numpy.union1d(numpy.linspace(low, high, max(min(initial, max_points - len(known) - 1), 1) + 1), known)
+    y = numpy.asarray(f(x), dtype=numpy.float64)
+    min_width = (high - low) / pixel_width
+    check = numpy.ones(len(x) - 1, dtype=bool)
+
+    while len(x) < max_points:
+        candidates = numpy.flatnonzero(check & (numpy.diff(x) > 2 * min_width))
+        if not len(candidates):
+            break
+        left, right = candidates, candidates + 1
+        mid = (x[left] + x[right]) / 2
+        y_mid = numpy.asarray(f(mid), dtype=numpy.float64)
+
+        finite = y[numpy.isfinite(y)]
+        scale = numpy.ptp(finite) if len(finite) else 0.0
+        error = numpy.abs(y_mid - (y[left] + y[right]) / 2) / (scale if scale > 0 else 1.0)
+        error[y[left] * y[right] < 0] = numpy.inf # a sign change hides a root
+        refine = numpy.flatnonzero(error > tolerance)
+        if not len(refine):
+            break
+
+        budget = max_points - len(x)
+        if len(refine) > budget: # spend the remaining points on the worst intervals
+            refine = numpy.sort(refine[numpy.argsort(-error[refine], kind="stable")[:budget]])
+
+        x = numpy.insert(x, right[refine], mid[refine])
+        y = numpy.insert(y, right[refine], y_mid[refine])
+        # only the two halves of each split interval need checking next round
+        inserted = right[refine] + numpy.arange(len(refine))
+        check = numpy.zeros(len(x) - 1, dtype=bool)
+        check[inserted - 1] = True
+        check[inserted] = True
+    return (x, y)
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+
+"""Long-running JSON-lines server for the polynomials CLI (--serve SOCKET|-).
+
+Each request is one JSON object per line with an "op" and an optional "id", read from \
+standard input or from any number of clients of a local Unix socket:
+
+    {"id": 1, "op": "factor", "coefficients": [1, -3, 2]}
+    {"id": 2, "op": "roots", "coefficients": [[1, 0, -2], [1, 2, 3, 4]]}
+    {"id": 3, "op": "evaluate", "coefficients": [1, 0, -2], "low": -2, "high": 2, "points": 5}
+    {"id": 4, "op": "factor_range", "coefficients": [1, 4, -32], "start": 1, "stop": 4}
+    {"id": 5, "op": "stats"}
+
+Coefficients are in order of decreasing power of x, as numbers, strings like "3/4" or one \
+string in --batch line format. Every response is one JSON line with the request's id and \
+either a "result" or an "error". Responses are written as soon as they are ready, so they \
+can come back out of order.
+
+Requests are read and answered by an asyncio loop while the work runs in a process pool \
+that lives as long as the server, so the workers' curvecache results, prime \
+factorizations and Quadratics with their factor pairs stay warm between requests. At most \
+max_pending requests are in the pool at once and further ones wait in the queue, up to \
+pending_per_connection per connection before the server stops reading from it. The stats \
+op reports the queue depth and the latency of recent requests. --serve only replaces a \
+stale socket at its path, never a regular file or a symlink.
+
+Client is a small asyncio client for the socket, used by the tests and by \
+benchmarks/load_server.py to load-test a server on one machine.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import stat
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+
+import batch
+import curvecache
+from polynomials import Quadratic, horner
+
+# requests in the pool per worker process
+pending_per_job = 4
+# unanswered requests after which a connection isn't read until one is answered
+pending_per_connection = 256
+
+def parse_coefficients(value):
+    """Coefficient strings from a JSON list of numbers or strings, or from one line in --batch format"""
+    if isinstance(value, str):
+        return batch.parse_line(value) or []
+    if not isinstance(value, list) or any(isinstance(c, (list, dict, bool)) or c is None for c in value):
+        raise ValueError("coefficients must be a list of numbers or a string")
+    return [str(c) for c in value]
+
+@lru_cache(maxsize=256)
+def _quadratic(key):
+    """Quadratic for a curvecache.key of its coefficients, kept so its factor pairs are reused by later requests"""
+    return Quadratic(*key[1])
+
+def factor(request):
+    return batch.analyze(parse_coefficients(request["coefficients"]))
+
+def roots(request):
+    """Numeric roots as [real, imag] pairs, for one polynomial or a list of them solved as one batch"""
+    import numpy
+    import rootsolver
+    value = request["coefficients"]
+    single = not (isinstance(value, list) and value and isinstance(value[0], list))
+    rows = [parse_coefficients(value)] if single else [parse_coefficients(row) for row in value]
+    if len({len(row) for row in rows}) != 1:
+        raise ValueError("polynomials solved together must have the same degree")
+    coefficients = numpy.array([[complex(Fraction(c)) for c in row] for row in rows])
+    values, converged, _ = rootsolver.roots(coefficients, full_output=True)
+    results = [{"roots": [[z.real, z.imag] for z in row.tolist()], "converged": bool(done)}
+               for row, done in zip(values, converged)]
+    return results[0] if single else results
+
+def evaluate(request):
+    """Float values at 'points' evenly spaced x from 'low' to 'high', cached in curvecache.default_cache()"""
+    coefficients = parse_coefficients(request["coefficients"])
+    low, high = float(request.get("low", -10)), float(request.get("high", 10))
+    points = int(request.get("points", 101))
+    if not 1 <= points <= 10**6:
+        raise ValueError("points must be between 1 and 1000000, got {}".format(points))
+    return curvecache.default_cache().get_or_compute(curvecache.key("evaluate", coefficients, low, high, points),
+                                                     _evaluate, coefficients, low, high, points)
+
+def _evaluate(coefficients, low, high, points):
+    import numpy
+    x = numpy.linspace(low, high, points)
+    y = horner([Fraction(c) for c in coefficients], x)
+    if numpy.iscomplexobj(y):
+        return {"x": x.tolist(), "y": [[v.real, v.imag] for v in y.tolist()]}
+    return {"x": x.tolist(), "y": y.tolist()}
+
+def factor_range(request):
+    """Factor pairs (px + q)(rx + s) of a quadratic for p from 'start' up to 'stop' by 'step'"""
+    coefficients = parse_coefficients(request["coefficients"])
+    if len(coefficients) != 3:
+        raise ValueError("factor_range needs the 3 coefficients of a quadratic")
+    f = _quadratic(curvecache.key("quadratic", coefficients))
+    family = f.factor_range(request.get("start", 1), request.get("stop", 8), request.get("step", 1))
+    f.factor_families.remove(family) # only the server's cache keeps the Quadratic alive
+    return {"polynomial": str(f), "factors": [[str(line) for line in pair] for pair in family]}
+
+OPERATIONS = {"factor": factor, "roots": roots, "evaluate": evaluate, "factor_range": factor_range}
+
+def handle(request):
+    """Worker entry point: the result of one request, or raises for a bad one"""
+    return OPERATIONS[request["op"]](request)
+
+def _is_socket(path):
+    """True if 'path' itself (not a symlink target) is a Unix socket"""
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except FileNotFoundError:
+        return False
+
+class Server():
+    """Answers JSON-line requests with 'jobs' worker processes (all CPUs by default, 0 for this process)"""
+
+    def __init__(self, jobs=None, max_pending=None, latency_window=1000):
+        self.jobs = (os.cpu_count() or 1) if jobs is None else jobs
+        self.max_pending = max_pending or max(self.jobs, 1) * pending_per_job
+        self.latency_window = latency_window
+        self.executor = None
+        self.reset()
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.requests = self.errors = 0
+        self.queued = self.running = self.peak_queued = 0
+        self.operations = Counter()
+        self.latencies = deque(maxlen=self.latency_window)
+
+    # Lifecycle
+
+    async def __aenter__(self):
+        self._slots = asyncio.Semaphore(self.max_pending)
+        if self.jobs:
+            # workers open their own connection to the same cache database
+            self.executor = ProcessPoolExecutor(max_workers=self.jobs, initializer=curvecache.configure,
+                                                initargs=(curvecache.default_cache().path,))
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    # Requests
+
+    async def respond(self, line):
+        """JSON response line (without the newline) for one request line"""
+        started = time.perf_counter()
+        self.requests += 1
+        request = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            op = request.get("op")
+            self.operations[op if op in OPERATIONS or op == "stats" else "unknown"] += 1
+            if op == "stats":
+                result = self.stats()
+            elif op in OPERATIONS:
+                result = await self._run(request)
+            else:
+                raise ValueError("unknown op {!r}, expected one of {}".format(op, ", ".join(list(OPERATIONS) + ["stats"])))
+            response = {"id": request.get("id"), "result": result}
+        except Exception as e:
+            self.errors += 1
+            response = {"id": request.get("id") if isinstance(request, dict) else None,
+                        "error": "{}: {}".format(type(e).__name__, e)}
+        self.latencies.append(time.perf_counter() - started)
+        return json.dumps(response)
+
+    async def _run(self, request):
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        self.running += 1
+        try:
+            if self.executor is None:
+                return handle(request)
+            return await asyncio.get_running_loop().run_in_executor(self.executor, handle, request)
+        finally:
+            self.running -= 1
+            self._slots.release()
+
+    def stats(self):
+        """Queue depth, request counts and latency in milliseconds over the last latency_window requests"""
+        latencies = sorted(self.latencies)
+        def percentile(fraction):
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000 if latencies else 0.0
+        return {"uptime": time.monotonic() - self.started, "jobs": self.jobs, "requests": self.requests, "errors": self.errors,
+                "queued": self.queued, "running": self.running, "peak_queued": self.peak_queued, "max_pending": self.max_pending,
+                "operations": dict(self.operations),
+                "latency_ms": {"count": len(latencies), "mean": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+                               "p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99), "max": percentile(1)}}
+
+    # Transports
+
+    async def serve_stream(self, readline, write, drain=None):
+        """Answer every line returned by the coroutine readline() with write(bytes) until it returns b"" """
+        tasks = set()
+        async def answer(line):
+            write((await self.respond(line)).encode() + b"\n")
+            if drain is not None:
+                await drain()
+        while True:
+            line = await readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            task = asyncio.create_task(answer(line))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            # stop reading so a fast client can't queue requests without bound
+            while len(tasks) >= pending_per_connection:
+                await asyncio.wait(set(tasks), return_when=asyncio.FIRST_COMPLETED)
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def _client(self, reader, writer):
+        try:
+            await self.serve_stream(reader.readline, writer.write, writer.drain)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve_unix(self, path, ready=None):
+        """Serve clients of the Unix socket at 'path' until cancelled, calling ready() once it is listening.
+
+        A stale socket left at 'path' is replaced, anything else there raises FileExistsError and is left alone.
+        """
+        if _is_socket(path):
+            os.unlink(path)
+        elif os.path.lexists(path):
+            raise FileExistsError("%s exists and is not a socket" % path)
+        server = await asyncio.start_unix_server(self._client, path, limit=2**24)
+        try:
+            if ready is not None:
+                ready()
+            async with server:
+                await server.serve_forever()
+        finally:
+            if _is_socket(path):
+                os.unlink(path)
+
+    async def serve_stdio(self):
+        """Serve requests from standard input, writing the responses to standard output"""
+        loop = asyncio.get_running_loop()
+        lines = asyncio.Queue(maxsize=pending_per_connection)
+        # a daemon thread reads, which works for files as well as pipes and terminals and doesn't hold up exiting
+        def read():
+            for line in iter(sys.stdin.buffer.readline, b""):
+                asyncio.run_coroutine_threadsafe(lines.put(line), loop).result()
+            asyncio.run_coroutine_threadsafe(lines.put(b""), loop)
+        threading.Thread(target=read, daemon=True).start()
+        def write(data):
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+        await self.serve_stream(lines.get, write)
+
+class Client():
+    """Client of a server's Unix socket matching responses to concurrent requests by id"""
+
+    def __init__(self, path):
+        self.path = path
+        self._ids = 0
+        self._waiting = {}
+
+    async def __aenter__(self):
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path, limit=2**24)
+        self._receiver = asyncio.create_task(self._receive())
+        return self
+
+    async def __aexit__(self, *exc):
+        self._writer.close()
+        self._receiver.cancel()
+
+    async def _receive(self):
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            future = self._waiting.pop(response.get("id"), None)
+            if future is not None:
+                future.set_result(response)
+        for future in self._waiting.values():
+            future.set_exception(ConnectionError("server closed the connection"))
+
+    async def request(self, op, **fields):
+        """Full response to one request, a dict with "result" or "error" """
+        self._ids += 1
+        future = self._waiting[self._ids] = asyncio.get_running_loop().create_future()
+        self._writer.write(json.dumps(dict(fields, id=self._ids, op=op)).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+def run(path="-", jobs=None, max_pending=None):
+    """Serve on standard input/output for '-', otherwise on the Unix socket 'path' until interrupted or terminated"""
+    async def serve():
+        # SIGTERM shuts the pool down too instead of leaving its workers behind
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        async with Server(jobs, max_pending) as server:
+            if path == "-":
+                await server.serve_stdio()
+            else:
+                await server.serve_unix(path, lambda: print("listening on %s" % path, file=sys.stderr))
+    try:
+        asyncio.run(serve())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    except FileExistsError as e:
+        sys.exit("FileExistsError: %s" % e)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+
+"""Exact quadratic surds rational + coefficient*sqrt(radicand).
+
+Quadratic.find_roots uses these for the square root of a discriminant that isn't the \
+square of a rational, in place of a float square root converted to a Fraction with a \
+~2**52 denominator. Surds with the same radicand are closed under +, -, *, / and integer \
+powers, and results that turn out rational come back as plain Fractions. Mixing surds \
+of different radicands, or a surd with a float, falls back to float arithmetic.
+
+sqrt() never factors its argument fully, which would stall on large semiprime \
+discriminants. It only divides out the squares of primes below square_factor_bound, so a \
+radicand is never a perfect square but may keep the square of a larger prime. Surds whose \
+radicands differ by a rational square factor are still recognized as the same field.
+"""
+
+import math
+from fractions import Fraction
+from numbers import Integral, Rational, Real
+
+from primes import sieve
+
+# primes whose squares sqrt() divides out of the radicand
+square_factor_bound = 1000
+_primes = sieve(square_factor_bound)
+
+def sqrt(value):
+    """Exact square root of a non-negative rational, as a Fraction if it is a perfect square else a Surd"""
+    value = Fraction(value)
+    if value < 0:
+        raise ValueError("math domain error")
+
+    n, d = value.numerator, value.denominator
+    root_n, root_d = math.isqrt(n), math.isqrt(d)
+    if root_n * root_n == n and root_d * root_d == d:
+        return Fraction(root_n, root_d)
+
+    # sqrt(n/d) = sqrt(n*d)/d = k*sqrt(m)/d, m is not a square since n/d isn't one
+    k, m = 1, n * d
+    for prime in _primes:
+        square = prime * prime
+        if square > m:
+            break
+        while m % square == 0:
+            m //= square
+            k *= prime
+    return Surd(0, Fraction(k, d), m)
+
+def surd(rational, coefficient, radicand):
+    """rational + coefficient*sqrt(radicand), collapsing to a Fraction when the irrational part vanishes"""
+    if coefficient == 0 or radicand == 1:
+        return Fraction(rational + coefficient)
+    return Surd._new(rational if type(rational) is Fraction else Fraction(rational),
+                     coefficient if type(coefficient) is Fraction else Fraction(coefficient), radicand)
+
+def _sign(x):
+    return (x > 0) - (x < 0)
+
+class Surd(Real):
+    """Surd(rational, coefficient, radicand) -> rational + coefficient*sqrt(radicand).
+
+    rational and coefficient are stored as Fractions and radicand must be an integer > 1 that isn't a
+    perfect square. It doesn't have to be square-free.
+    """
+
+    __slots__ = ("_rational", "_coefficient", "_radicand")
+
+    def __init__(self, rational, coefficient, radicand):
+        if radicand < 2:
+            raise ValueError("radicand must be an integer > 1 that isn't a perfect square")
+        self._rational = Fraction(rational)
+        self._coefficient = Fraction(coefficient)
+        self._radicand = int(radicand)
+
+    @classmethod
+    def _new(cls, rational, coefficient, radicand):
+        """Trusted constructor for Fraction components and a valid radicand"""
+        self = object.__new__(cls)
+        self._rational = rational
+        self._coefficient = coefficient
+        self._radicand = radicand
+        return self
+
+# Properties
+    @property
+    def rational(self):
+        return self._rational
+
+    @property
+    def coefficient(self):
+        return self._coefficient
+
+    @property
+    def radicand(self):
+        return self._radicand
+
+    @property
+    def denominator(self):
+        """Common denominator of the rational part and the coefficient"""
+        return math.lcm(self._rational.denominator, self._coefficient.denominator)
+
+# Methods
+    def conjugate_surd(self):
+        """rational - coefficient*sqrt(radicand), the algebraic conjugate"""
+        return Surd._new(self._rational, -self._coefficient, self._radicand)
+
+    def sign(self):
+        """Exact sign (-1 or 1) of the surd"""
+        a, b = self._rational, self._coefficient
+        if a == 0 or _sign(a) == _sign(b):
+            return _sign(b)
+        # opposite signs, so compare a**2 with b**2 * radicand (never equal as radicand isn't a square)
+        return _sign(a) if a * a > b * b * self._radicand else _sign(b)
+
+    def _parts(self, other):
+        """(rational, coefficient) of 'other' over this surd's radicand, or None if it isn't in the same field"""
+        t = type(other)
+        if t is Surd:
+            if other._radicand == self._radicand:
+                return (other._rational, other._coefficient)
+            # sqrt(o) = sqrt(o*r)/r * sqrt(r), in the same field if o*r is a square
+            product = other._radicand * self._radicand
+            root = math.isqrt(product)
+            if root * root != product:
+                return None
+            return (other._rational, other._coefficient * Fraction(root, self._radicand))
+        if t is Fraction or t is int:
+            return (other, 0)
+        if isinstance(other, Rational):
+            return (Fraction(other), 0)
+        return None
+
+    def _compare(self, other):
+        """Exact sign of self - other, or None if the comparison has to go through floats"""
+        parts = self._parts(other)
+        if parts is None:
+            return None
+        difference = surd(self._rational - parts[0], self._coefficient - parts[1], self._radicand)
+        return difference.sign() if isinstance(difference, Surd) else _sign(difference)
+
+# Comparison operators
+    def __eq__(self, other):
+        if isinstance(other, Surd) or isinstance(other, Rational):
+            return self._compare(other) == 0
+        if isinstance(other, Real):
+            return float(self) == other
+        return NotImplemented
+
+    def __lt__(self, other):
+        c = self._compare(other)
+        return float(self) < other if c is None else c < 0
+
+    def __le__(self, other):
+        c = self._compare(other)
+        return float(self) <= other if c is None else c <= 0
+
+    def __gt__(self, other):
+        c = self._compare(other)
+        return float(self) > other if c is None else c > 0
+
+    def __ge__(self, other):
+        c = self._compare(other)
+        return float(self) >= other if c is None else c >= 0
+
+    def __hash__(self):
+        # coefficient**2 * radicand doesn't depend on which square factors the radicand kept
+        return hash((self._rational, _sign(self._coefficient), self._coefficient**2 * self._radicand))
+
+# Unary operators
+    def __abs__(self):
+        return -self if self.sign() < 0 else self
+
+    def __neg__(self):
+        return Surd._new(-self._rational, -self._coefficient, self._radicand)
+
+    def __pos__(self):
+        return self
+
+    def __trunc__(self):
+        return math.floor(self) if self.sign() > 0 else math.ceil(self)
+
+    def __floor__(self):
+        result = math.floor(float(self))
+        # correct for rounding in the float approximation
+        while self < result:
+            result -= 1
+        while self >= result + 1:
+            result += 1
+        return result
+
+    def __ceil__(self):
+        return -math.floor(-self)
+
+    def __round__(self, ndigits=None):
+        return round(float(self), ndigits)
+
+# Binary operators
+    def __add__(self, other):
+        parts = self._parts(other)
+        if parts is None:
+            return float(self) + other
+        return surd(self._rational + parts[0], self._coefficient + parts[1], self._radicand)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        return self.__add__(-other)
+
+    def __rsub__(self, other):
+        return (-self).__add__(other)
+
+    def __mul__(self, other):
+        parts = self._parts(other)
+        if parts is None:
+            return float(self) * other
+        a, b, (c, d) = self._rational, self._coefficient, parts
+        return surd(a * c + b * d * self._radicand, a * d + b * c, self._radicand)
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def _inverse(self):
+        norm = self._rational**2 - self._coefficient**2 * self._radicand
+        return Surd._new(self._rational / norm, -self._coefficient / norm, self._radicand)
+
+    def __truediv__(self, other):
+        parts = self._parts(other) if isinstance(other, Surd) else None
+        if parts is not None:
+            return self * Surd._new(parts[0], parts[1], self._radicand)._inverse()
+        if isinstance(other, Rational):
+            if other == 0:
+                raise ZeroDivisionError("division by zero")
+            return surd(self._rational / other, self._coefficient / other, self._radicand)
+        return float(self) / other
+
+    def __rtruediv__(self, other):
+        if isinstance(other, Rational):
+            return self._inverse() * other
+        return other / float(self)
+
+    def __floordiv__(self, other):
+        return math.floor(self / other)
+
+    def __rfloordiv__(self, other):
+        return math.floor(other / self)
+
+    def __mod__(self, other):
+        return self - other * (self // other)
+
+    def __rmod__(self, other):
+        return other - self * (other // self)
+
+    def __pow__(self, power):
+        if isinstance(power, Integral):
+            base = self if power >= 0 else self._inverse()
+            power = abs(int(power))
+            result = Fraction(1)
+            while power:
+                if power & 1:
+                    result = base * result
+                power >>= 1
+                if power:
+                    base = base * base
+            return result
+        return float(self)**power
+
+    def __rpow__(self, base):
+        return base**float(self)
+
+# Conversions
+    def __float__(self):
+        return float(self._rational) + float(self._coefficient) * math.sqrt(self._radicand)
+
+    def __str__(self):
+        """(a + b√n)/d over the common denominator d"""
+        d = self.denominator
+        a, b = self._rational * d, self._coefficient * d
+        radical = "√%d" % self._radicand if abs(b) == 1 else "%s√%d" % (abs(b), self._radicand)
+        if a == 0:
+            text = ("-" if b < 0 else "") + radical
+            return text if d == 1 else "%s/%d" % (text, d)
+        text = "(%s %s %s)" % (a, "-" if b < 0 else "+", radical)
+        return text if d == 1 else "%s/%d" % (text, d)
+
+    def __repr__(self):
+        return "Surd(%r, %r, %r)" % (self._rational, self._coefficient, self._radicand)
@@ -3,23 +3,85 @@
 import numpy
 import random
 import sys
+from collections import deque
 from fractions import Fraction
-from time import sleep
+from time import perf_counter, sleep
 from numpy import linspace
 
 from polynomials import Binomial
 from polynomials import Trinomial
+from sampling import adaptive_sample
+import curvecache
 
+import matplotlib
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
 
 from PyQt5.QtWidgets import QApplication, QMainWindow, QMenu, QVBoxLayout, QSizePolicy, QMessageBox, QWidget, QPushButton, QLineEdit, QLabel
 from PyQt5.QtGui import QIcon, QFont
-from PyQt5.QtCore import pyqtSlot
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import pyqtSlot, pyqtSignal
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer
+
+def compute(a, b, c, low=-10, high=10, pixel_width=500):
+    """Title, x, f(x) and factor line segments for the plot of the Trinomial a, b, c.
+
+    Pure function of its arguments, run by ComputeJob on a worker thread. Results are
+    cached in curvecache.default_cache() by coefficients, x range, pixel width and precision policy.
+    """
+    key = curvecache.key("curve", (a, b, c), low, high, pixel_width)
+    return curvecache.default_cache().get_or_compute(key, _compute, a, b, c, low, high, pixel_width)
+
+def _compute(a, b, c, low, high, pixel_width):
+    f = Trinomial(a, b, c)
+    family = f.factor_range(-10, 11) if f.radical is not None else None
+
+    x, y = adaptive_sample(f.evaluate, low, high, f.roots, pixel_width=pixel_width)
+
+    # every factor line as an (n, 2, 2) array of end points for the LineCollection
+    segments = numpy.empty((0, 2, 2))
+    if family is not None:
+        ends = numpy.array([low, high], dtype=float)
+        ys = family.evaluate(ends).reshape(-1, 2).real
+        segments = numpy.stack((numpy.broadcast_to(ends, ys.shape), ys), axis=-1)
+
+    return ('f(x) = ' + str(f), x, y, segments)
+
+class WorkerSignals(QObject):
+    """Results of a ComputeJob, tagged with its generation and delivered on the GUI thread"""
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+class ComputeJob(QRunnable):
+    """compute() on a QThreadPool thread. Jobs whose generation is no longer current are dropped."""
+
+    def __init__(self, generation, current, signals, *args):
+        super().__init__()
+        self.generation = generation
+        self.current = current
+        self.signals = signals
+        self.args = args
+
+    def stale(self):
+        return self.generation != self.current()
+
+    def run(self):
+        if self.stale():
+            return
+        try:
+            result = compute(*self.args)
+        except Exception as e:
+            if not self.stale():
+                self.signals.failed.emit(self.generation, "{}: {}".format(type(e).__name__, e))
+            return
+        if not self.stale():
+            self.signals.finished.emit(self.generation, result)
 
 class App(QWidget):
+    # milliseconds of typing pause before the plot is recomputed
+    debounce_interval = 150
+
     def __init__(self):
         super().__init__()
         self.title = 'mathvis'
@@ -27,6 +89,15 @@ class App(QWidget):
         self.top=10
         self.width=800
         self.height=420
+
+        # one worker thread, a newer job replaces any queued one and makes a running one stale
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.generation = 0
+        self.signals = WorkerSignals()
+        self.signals.finished.connect(self.show_result)
+        self.signals.failed.connect(self.show_error)
+
         self.initUI()
 
     def initUI(self):
@@ -66,36 +137,75 @@ class App(QWidget):
         button_update.resize(80,30)
         button_update.clicked.connect(self.update)
 
+        self.label_frame = QLabel(self)
+        self.label_frame.move(510,330)
+        self.label_frame.resize(270,20)
+
+        self.label_status = QLabel(self)
+        self.label_status.move(510,80)
+        self.label_status.resize(270,20)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.debounce_interval)
+        self.timer.timeout.connect(self.update)
+        for text in (self.text_a, self.text_b, self.text_c):
+            text.textChanged.connect(self.timer.start)
+
         self.show()
 
     @pyqtSlot()
     def update(self):
-        a = self.text_a.text()
-        b = self.text_b.text()
-        c = self.text_c.text()
-        f = Trinomial(a, b, c)
+        """Start computing the plot for the current coefficients on the worker thread"""
+        self.timer.stop()
+        self.generation += 1
+        self.pool.clear()
+        self.pool.start(ComputeJob(self.generation, lambda: self.generation, self.signals,
+                                   self.text_a.text(), self.text_b.text(), self.text_c.text()))
 
-        for p in numpy.arange(Fraction(-10), Fraction(11), Fraction(1)):
-            f.factor(p)
+    @pyqtSlot(int, object)
+    def show_result(self, generation, result):
+        if generation != self.generation:
+            return
+        title, x, y, segments = result
+        self.label_status.setText("")
+        self.plotcanvas.update_plot(x, y, segments, title)
+        mean, worst = self.plotcanvas.frame_time()
+        self.label_frame.setText("frame %.1f ms (worst %.1f ms)" % (mean * 1000, worst * 1000))
 
-        self.plotcanvas.axes.clear()
+    @pyqtSlot(int, str)
+    def show_error(self, generation, message):
+        if generation == self.generation:
+            self.label_status.setText(message)
 
-        low = -10
-        high = 10
-        x = linspace(low, high, (high - low) * 10)
+class PlotCanvas(FigureCanvas):
+    """Canvas with a persistent curve, factor lines and title, redrawn by blitting.
 
-        self.plotcanvas.plot(x, f.evaluate(x), 'f(x) = ' + str(f))
-        for pair in f.factor_pairs.values():
-            for line in pair.binomials:
-                #pass
-                self.plotcanvas.plot(x, line.evaluate(x), linewidth=0.4)
+    The static parts of the figure are rendered by a full draw and cached as a background on
+    every draw_event (first show, resize). update_plot only sets the data of the animated
+    artists, restores the background and blits the figure, one partial redraw per update.
+    """
+
+    # number of recent update_plot timings kept for frame_time()
+    frame_history = 60
 
-class PlotCanvas(FigureCanvas):
     def __init__(self, parent=None, width=5, height=4, dpi=100):
         fig = Figure(figsize=(width,height), dpi=dpi)
         self.axes = fig.add_subplot(111)
         self.axes.plot([i - 12 for i in range(25)], [0 for i in range(25)], linewidth=0.5, color='black')
         self.axes.plot([0 for i in range(25)], [i - 12 for i in range(25)], linewidth=0.5, color='black')
+        # blitting needs a fixed view, autoscaling would invalidate the cached background
+        self.axes.set_xlim(-10, 10)
+        self.axes.set_ylim(-12, 12)
+        self.axes.autoscale(False)
+
+        colors = [style['color'] for style in matplotlib.rcParams['axes.prop_cycle']]
+        self.factor_lines = LineCollection([], linewidths=0.4, colors=colors, animated=True)
+        self.axes.add_collection(self.factor_lines)
+        self.curve, = self.axes.plot([], [], linewidth=1.0, color='C0', animated=True)
+        # inside the axes so the blitted region covers it
+        self.title = self.axes.text(0.5, 0.97, "", transform=self.axes.transAxes,
+                                    horizontalalignment='center', verticalalignment='top', animated=True)
 
         FigureCanvas.__init__(self, fig)
         self.setParent(parent)
@@ -105,11 +215,39 @@ class PlotCanvas(FigureCanvas):
                 QSizePolicy.Expanding)
         FigureCanvas.updateGeometry(self)
 
-    def plot(self, x_data, y_data, title=None, linewidth=1.0):
-        self.axes.plot(x_data, y_data, linewidth=linewidth)
-        if title != None:
-            self.axes.set_title(title)
-        self.draw()
+        self.background = None
+        self.frame_times = deque(maxlen=self.frame_history)
+        self.mpl_connect('draw_event', self.on_draw)
+
+    def on_draw(self, event):
+        """Cache the freshly drawn static background and paint the animated artists over it"""
+        self.background = self.copy_from_bbox(self.figure.bbox)
+        self.draw_artists()
+
+    def draw_artists(self):
+        for artist in (self.factor_lines, self.curve, self.title):
+            self.figure.draw_artist(artist)
+
+    def update_plot(self, x_data, y_data, segments, title):
+        """Show the curve (x_data, y_data), the factor line 'segments' and 'title' with one redraw"""
+        start = perf_counter()
+        self.curve.set_data(x_data, y_data)
+        self.factor_lines.set_segments(segments)
+        self.title.set_text(title)
+
+        if self.background is None: # nothing cached yet, the full draw caches it
+            self.draw()
+        else:
+            self.restore_region(self.background)
+            self.draw_artists()
+            self.blit(self.figure.bbox)
+        self.frame_times.append(perf_counter() - start)
+
+    def frame_time(self):
+        """(mean, worst) seconds per update_plot over the recent updates"""
+        if not self.frame_times:
+            return (0.0, 0.0)
+        return (sum(self.frame_times) / len(self.frame_times), max(self.frame_times))
 
 def main():
     app = QApplication(sys.argv)
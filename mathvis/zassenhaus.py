@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+
+"""Factorization of integer polynomials into irreducibles (Zassenhaus' algorithm).
+
+A square-free primitive polynomial f is factored modulo a small prime p (distinct-degree \
+then Cantor-Zassenhaus equal-degree splitting), the modular factors are Hensel lifted to \
+p**k with p**k beyond twice the Mignotte bound on the coefficients of any factor of f, and \
+subsets of lifted factors are recombined into the true factors over the integers.
+
+Polynomials are coefficient lists in order of decreasing power, as in polyarith. Modular \
+polynomials hold ints in range(modulus) and are trimmed of leading zeros.
+"""
+
+import math
+import random
+from itertools import combinations
+
+import polyarith
+from primes import sieve
+
+# odd primes to factor modulo, Cantor-Zassenhaus splitting needs p > 2
+_primes = sieve(2000)[1:]
+# number of usable primes to try before settling on the one giving the fewest modular factors
+prime_trials = 5
+
+# Arithmetic modulo m
+def _trim(a):
+    i = 0
+    while i < len(a) and a[i] == 0:
+        i += 1
+    return a[i:]
+
+def _reduce(a, m):
+    return _trim([c % m for c in a])
+
+def _add(a, b, m):
+    if len(a) < len(b):
+        a, b = b, a
+    offset = len(a) - len(b)
+    return _trim(a[:offset] + [(x + y) % m for x, y in zip(a[offset:], b)])
+
+def _sub(a, b, m):
+    return _add(a, [-y % m for y in b], m)
+
+def _mul(a, b, m):
+    if not a or not b:
+        return []
+    result = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                result[i + j] += x * y
+    return _reduce(result, m)
+
+def _divmod(a, b, m):
+    """Division by b, whose leading coefficient must be invertible modulo m"""
+    if len(a) < len(b):
+        return ([], a)
+    inverse = pow(b[0], -1, m)
+    remainder = list(a)
+    quotient = []
+    for i in range(len(a) - len(b) + 1):
+        c = remainder[i] * inverse % m
+        quotient.append(c)
+        if c:
+            for j in range(1, len(b)):
+                remainder[i + j] = (remainder[i + j] - c * b[j]) % m
+    return (_trim(quotient), _trim(remainder[len(a) - len(b) + 1:]))
+
+def _rem(a, b, m):
+    return _divmod(a, b, m)[1]
+
+def _monic(a, m):
+    if not a or a[0] == 1:
+        return a
+    inverse = pow(a[0], -1, m)
+    return [c * inverse % m for c in a]
+
+def _gcd(a, b, p):
+    """Monic greatest common divisor modulo the prime p"""
+    while b:
+        a, b = b, _rem(a, b, p)
+    return _monic(a, p)
+
+def _gcdex(a, b, p):
+    """Return (s, t) with s*a + t*b = 1 modulo the prime p, for coprime a and b"""
+    r0, r1, s0, s1, t0, t1 = a, b, [1], [], [], [1]
+    while r1:
+        q, r = _divmod(r0, r1, p)
+        r0, r1 = r1, r
+        s0, s1 = s1, _sub(s0, _mul(q, s1, p), p)
+        t0, t1 = t1, _sub(t0, _mul(q, t1, p), p)
+    inverse = pow(r0[0], -1, p)
+    return ([c * inverse % p for c in s0], [c * inverse % p for c in t0])
+
+def _powmod(base, exponent, modulus, p):
+    """base**exponent modulo the polynomial modulus and the prime p"""
+    result = [1]
+    base = _rem(base, modulus, p)
+    while exponent:
+        if exponent & 1:
+            result = _rem(_mul(result, base, p), modulus, p)
+        exponent >>= 1
+        if exponent:
+            base = _rem(_mul(base, base, p), modulus, p)
+    return result
+
+def _symmetric(a, m):
+    """Representatives of the coefficients in (-m/2, m/2]"""
+    half = m // 2
+    return polyarith.trim([c - m if c > half else c for c in a])
+
+# Factoring modulo p
+def _distinct_degree(f, p):
+    """Split monic square-free f into (product of all irreducible factors of degree d, d) pairs"""
+    result = []
+    h = [1, 0]
+    d = 0
+    while len(f) - 1 >= 2 * (d + 1):
+        d += 1
+        h = _powmod(h, p, f, p)
+        g = _gcd(f, _sub(h, [1, 0], p), p)
+        if len(g) > 1:
+            result.append((g, d))
+            f = _divmod(f, g, p)[0]
+            h = _rem(h, f, p)
+    if len(f) > 1:
+        result.append((f, len(f) - 1))
+    return result
+
+def _equal_degree(f, d, p):
+    """Split monic f, a product of irreducible factors all of degree d, with Cantor-Zassenhaus"""
+    n = len(f) - 1
+    if n == d:
+        return [f]
+    while True:
+        a = _trim([random.randrange(p) for _ in range(n)])
+        if len(a) < 2:
+            continue
+        g = _gcd(f, a, p)
+        if len(g) == 1:
+            g = _gcd(f, _sub(_powmod(a, (p**d - 1) // 2, f, p), [1], p), p)
+        if 1 < len(g) < len(f):
+            return _equal_degree(g, d, p) + _equal_degree(_divmod(f, g, p)[0], d, p)
+
+def factor_mod_p(f, p):
+    """Monic irreducible factors of the square-free polynomial f modulo the odd prime p"""
+    f = _monic(_reduce(f, p), p)
+    factors = []
+    for g, d in _distinct_degree(f, p):
+        factors.extend(_equal_degree(g, d, p))
+    return factors
+
+# Hensel lifting
+def _hensel_step(f, g, h, s, t, m):
+    """Lift f = g*h, s*g + t*h = 1 from modulo m to modulo m**2 (h monic)"""
+    m2 = m * m
+    e = _sub(_reduce(f, m2), _mul(g, h, m2), m2)
+    q, r = _divmod(_mul(s, e, m2), h, m2)
+    g = _add(g, _add(_mul(t, e, m2), _mul(q, g, m2), m2), m2)
+    h = _add(h, r, m2)
+    b = _sub(_add(_mul(s, g, m2), _mul(t, h, m2), m2), [1], m2)
+    c, d = _divmod(_mul(s, b, m2), h, m2)
+    s = _sub(s, d, m2)
+    t = _sub(t, _add(_mul(t, b, m2), _mul(c, g, m2), m2), m2)
+    return (g, h, s, t)
+
+def hensel_lift(f, factors, p, k):
+    """Lift monic factors with f = lc(f) * product(factors) modulo p to monic factors modulo p**k"""
+    modulus = p**k
+    if len(factors) == 1:
+        return [_monic(_reduce(f, modulus), modulus)]
+
+    half = len(factors) // 2
+    g = [f[0] % p]
+    for factor in factors[:half]:
+        g = _mul(g, factor, p)
+    h = [1]
+    for factor in factors[half:]:
+        h = _mul(h, factor, p)
+    s, t = _gcdex(g, h, p)
+
+    m = p
+    while m < modulus:
+        g, h, s, t = _hensel_step(f, g, h, s, t, m)
+        m *= m
+    g, h = _reduce(g, modulus), _reduce(h, modulus)
+    return hensel_lift(g, factors[:half], p, k) + hensel_lift(h, factors[half:], p, k)
+
+# Factoring over the integers
+def _choose_prime(f):
+    """Pick a prime p not dividing lc(f) with f square-free modulo p, preferring few modular factors"""
+    best = None
+    trials = 0
+    derivative = polyarith.derivative(f)
+    for p in _primes:
+        if f[0] % p == 0:
+            continue
+        fp = _monic(_reduce(f, p), p)
+        if len(_gcd(fp, _reduce(derivative, p), p)) > 1:
+            continue
+        factors = factor_mod_p(fp, p)
+        if best is None or len(factors) < len(best[1]):
+            best = (p, factors)
+        trials += 1
+        if trials >= prime_trials or len(factors) == 1:
+            break
+    if best is None:
+        raise ValueError("no suitable prime found, is the polynomial square-free?")
+    return best
+
+def _coefficient_bound(f):
+    """Bound on the coefficients of lc(f)/lc(g) * g for any factor g of f (Mignotte)"""
+    norm = math.isqrt(sum(c * c for c in f)) + 1
+    return abs(f[0]) * 2**(len(f) - 1) * norm
+
+def factor_squarefree(f):
+    """Irreducible factors of a square-free primitive integer polynomial with positive leading coefficient"""
+    if len(f) <= 2:
+        return [f]
+
+    p, modular = _choose_prime(f)
+    if len(modular) == 1:
+        return [f]
+
+    k = 1
+    bound = 2 * _coefficient_bound(f)
+    while p**k <= bound:
+        k += 1
+    modulus = p**k
+    lifted = hensel_lift(f, modular, p, k)
+
+    # recombine subsets of lifted factors, smallest subsets first
+    factors = []
+    size = 1
+    while 2 * size <= len(lifted):
+        for subset in combinations(range(len(lifted)), size):
+            lead = f[0]
+            g = [lead]
+            h = [lead]
+            for i, factor in enumerate(lifted):
+                if i in subset:
+                    g = _mul(g, factor, modulus)
+                else:
+                    h = _mul(h, factor, modulus)
+            g, h = _symmetric(g, modulus), _symmetric(h, modulus)
+            if g[-1] * h[-1] != lead * f[-1] or polyarith.mul(g, h) != polyarith.scale(f, lead):
+                continue
+            factors.append(polyarith.primitive(g))
+            f = polyarith.primitive(h)
+            lifted = [factor for i, factor in enumerate(lifted) if i not in subset]
+            break
+        else:
+            size += 1
+    factors.append(f)
+    return factors
+
+def factor(f):
+    """Factor an integer polynomial into (content, [(irreducible factor, multiplicity), ...]).
+
+    Factors are primitive with positive leading coefficients, sorted by degree then coefficients.
+    """
+    f = polyarith.trim(f)
+    if not f:
+        return (0, [])
+    c = polyarith.content(f)
+    f = [x // c for x in f]
+    if len(f) == 1:
+        return (c, [])
+
+    # factor the square-free part, then recover multiplicities by dividing them out of f
+    g = polyarith.gcd(f, polyarith.derivative(f))
+    squarefree = polyarith.exact_divide(f, g) if len(g) > 1 else f
+    result = []
+    for irreducible in factor_squarefree(polyarith.primitive(squarefree)):
+        multiplicity = 0
+        quotient = polyarith.exact_divide(f, irreducible)
+        while quotient is not None:
+            f = quotient
+            multiplicity += 1
+            quotient = polyarith.exact_divide(f, irreducible)
+        result.append((irreducible, multiplicity))
+    return (c * f[0], sorted(result, key=lambda item: (len(item[0]), item[0])))
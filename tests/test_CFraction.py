@@ -1,10 +1,31 @@
+import cmath
 from mathvis.cfractions import CFraction
+from fractions import Fraction
+from functools import reduce
+from operator import mul
 
 def test_constructor():
-    pass
+    assert CFraction((1,2), 3) == complex(0.5, 3)
+    assert CFraction(Fraction(6,4), (-2,8)) == CFraction((3,2), (-1,4))
+    assert CFraction(1-2j) == CFraction(1, -2)
+    assert CFraction(CFraction(5, 7)) == CFraction(5, 7)
+    assert repr(CFraction((1,2), 3).real) == "1/2"
+    assert not hasattr(CFraction(1, 1), "__dict__")
 
 def test_eq():
-    pass
+    assert CFraction((1,2), (3,4)) == CFraction((2,4), (6,8))
+    assert CFraction(3, 0) == 3 and CFraction((3,2), 0) == Fraction(3, 2) and CFraction(1, 2) == 1+2j
+    assert CFraction(3, 1) != 3 and CFraction(1, 2) != None
+
+def test_shared_denominator():
+    z = CFraction((1,6), (3,4)) * CFraction((2,3), (-5,2)) + Fraction(7, 12)
+    assert (z.real, z.imag) == (Fraction(1,6) * Fraction(2,3) + Fraction(3,4) * Fraction(5,2) + Fraction(7,12),
+                                Fraction(1,6) * Fraction(-5,2) + Fraction(3,4) * Fraction(2,3))
+    # components come back in lowest terms however the shared denominator cancels
+    w = CFraction((1,2), (1,3)) + CFraction((1,2), (2,3))
+    assert (w.real, w.imag, w.real.denominator) == (1, 1, 1)
+    assert CFraction((1,4), (1,4)) / CFraction((1,4), (-1,4)) == CFraction(0, 1)
+    assert CFraction(1, 1)**2 == CFraction(0, 2) and CFraction((1,2), (1,2))**2 == CFraction(0, (1,2))
 
 def test_neg_pos():
     pass
@@ -24,7 +45,25 @@ def test_complex_powers():
     pass
 
 def test_negative_powers():
-    pass
+    cf = CFraction(3, -4)**-5
+    cm = complex(3, -4)**-5
+    assert cmath.isclose(complex(cf), cm, rel_tol=1e-15)
+
+    z = CFraction((1,2), (-2,3))
+    assert z**-3 == 1 / (z * z * z)
+    assert CFraction(0, 2)**-1 == CFraction(0, (-1,2))
+
+def test_large_powers():
+    z = CFraction((3,5), (4,5))
+    assert z**37 == reduce(mul, (z for _ in range(37)))
+    assert cmath.isclose(complex(z**1000), complex(0.6, 0.8)**1000, rel_tol=1e-12)
+    assert abs(z**1000) == 1 and abs(z**-1000) == 1
+
+    assert CFraction(1, 1)**64 == 2**32
+    assert CFraction(1, 1)**-64 == Fraction(1, 2**32)
+    cf = CFraction(19, 17)**40
+    cm = complex(19, 17)**40
+    assert cmath.isclose(complex(cf), cm, rel_tol=1e-14)
 
 def test_rational_powers():
     assert CFraction(1)**0 == complex(1)**0
@@ -0,0 +1,48 @@
+import numpy
+from mathvis.cfractionarrays import CFractionArray
+from mathvis.cfractions import CFraction
+from fractions import Fraction
+
+values = [CFraction((3, 4), -2), CFraction(0, (1, 7)), CFraction(-5, 9), CFraction((22, 7), (-13, 5))]
+others = [CFraction(1, 1), CFraction((2, 3), 4), CFraction(-1, (1, 2)), CFraction(0, -3)]
+
+def test_constructor():
+    a = CFractionArray([1, 2j, Fraction(1, 3), CFraction(1, (1, 2))])
+    assert a.dtype == numpy.int64
+    assert list(a) == [CFraction(1), CFraction(0, 2), CFraction((1, 3)), CFraction(1, (1, 2))]
+    assert list(CFractionArray(numpy.arange(3))) == [0, 1, 2]
+
+def test_arithmetic_matches_cfraction():
+    a, b = CFractionArray(values), CFractionArray(others)
+    assert list(a + b) == [x + y for x, y in zip(values, others)]
+    assert list(a - b) == [x - y for x, y in zip(values, others)]
+    assert list(a * b) == [x * y for x, y in zip(values, others)]
+    assert list(a / b) == [x / y for x, y in zip(values, others)]
+    assert list(a * 3 - 1) == [x * 3 - 1 for x in values]
+
+def test_powers():
+    a = CFractionArray(values)
+    for power in (0, 1, 2, 7, -3):
+        assert list(a**power) == [x**power for x in values]
+
+def test_overflow_fallback():
+    a = CFractionArray([2**40 + 1, CFraction((1, 3**30), 5)])
+    assert a.dtype == numpy.int64
+    cube = a**3
+    assert cube.dtype == object
+    assert list(cube) == [CFraction(2**40 + 1)**3, CFraction((1, 3**30), 5)**3]
+    assert (cube / a / a).dtype == numpy.int64
+
+def test_conversions():
+    a = CFractionArray(values)
+    assert list(a.conjugate()) == [x.conjugate() for x in values]
+    assert list(a.limit_denominator(5)) == [x.limit_denominator(5) for x in values]
+    assert a.to_complex().dtype == numpy.complex128
+    assert list(a.to_complex()) == [complex(x) for x in values]
+
+def test_zero_division():
+    try:
+        CFractionArray(values) / CFractionArray([1, 0, 1, 1])
+        assert False
+    except ZeroDivisionError:
+        assert True
@@ -0,0 +1,189 @@
+import numpy
+from mathvis.polynomials import Polynomial, Quadratic, Line, horner, integer_horner, divisors, instrumentation
+from mathvis.cfractions import CFraction
+from fractions import Fraction
+
+def test_evaluate_exact():
+    f = Polynomial(2, -3, 0, 5)
+    assert f.evaluate(Fraction(1, 2)) == Fraction(9, 2)
+    assert f.evaluate([0, 1, -1]) == [5, 4, 0]
+    assert isinstance(f.evaluate(3), Fraction)
+
+def test_evaluate_array():
+    f = Polynomial(2, -3, 0, 5)
+    x = numpy.linspace(-3, 3, 61)
+    y = f.evaluate(x)
+    assert y.dtype == numpy.float64
+    assert numpy.allclose(y, 2*x**3 - 3*x**2 + 5)
+    assert f.evaluate(x, exact=True)[0] == f.evaluate(Fraction(-3))
+
+def test_evaluate_switches():
+    f = Quadratic(1, 0, -2)
+    assert f.evaluate(Fraction(3), exact=False) == 7.0
+    assert f.evaluate([1, 2], dtype=numpy.float32).dtype == numpy.float32
+    try:
+        f.evaluate(1, dtype=numpy.float64, exact=True)
+        assert False
+    except ValueError:
+        assert True
+
+def test_evaluate_complex():
+    line = Line(1, CFraction(2, -1))
+    assert line.evaluate(3) == CFraction(5, -1)
+    assert line.evaluate(numpy.array([3.0]))[0] == 5-1j
+    assert horner([1, 0, 1], 1j) == 0
+
+def expand(*binomials):
+    """Coefficients of the product of (a x + b) binomials"""
+    coefficients = [1]
+    for a, b in binomials:
+        coefficients = [x * a + y * b for x, y in zip(coefficients + [0], [0] + coefficients)]
+    return coefficients
+
+def test_divisors():
+    assert divisors(12) == [1, 2, 3, 4, 6, 12]
+    assert divisors(-7) == [1, 7]
+    assert len(divisors(2**20)) == 21
+
+def test_factor_composite_coefficients():
+    f = Polynomial(*expand((1, -2**20), (2, 3), (4, -1), (1, 0), (1, 5), (1, -6)))
+    f.factor()
+    roots = sorted(-line.b / line.a for line in f.factor_sets[0][:-1])
+    roots += sorted(-line.b / line.a for line in f.factor_sets[0][-1])
+    assert sorted(roots) == sorted([2**20, Fraction(-3, 2), Fraction(1, 4), 0, -5, 6])
+
+def test_factor_irreducible():
+    f = Polynomial(1, -3, 3, -9, 2, -6) # (x - 3)(x^2 + 1)(x^2 + 2)
+    f.factor()
+    factors = f.factor_sets[0]
+    assert factors[0] == Line(1, -3)
+    assert len(factors) == 3
+    magnitudes = sorted(round(abs(complex(-line.b / line.a))**2, 9) for pair in factors[1:] for line in pair)
+    assert magnitudes == [1, 1, 2, 2]
+
+    g = Polynomial(2, 0, -20, 0, 2)
+    g.factor()
+    assert len(g.factor_sets[0]) == 1 and str(g.factor_sets[0][0]) == "2x^4 - 20x^2 + 2"
+
+def test_factor_irreducible_keeps_content():
+    f = Polynomial(2, 0, 0, 6)
+    f.factor()
+    assert [str(factor) for factor in f.factor_sets[0]] == ["2x^3 + 6"]
+    g = Polynomial(12, -12, 12, 108, -192, 252, 72, -252) # 12 (x - 1)(x^3 - 2x + 7)(x^3 + 3x + 3)
+    g.factor()
+    assert Polynomial.from_factors(*g.factor_sets[0]) == g
+
+def test_factor_stats():
+    f = Polynomial(*expand((1, -3), (2, 1), (1, 4), (1, 0), (1, 1)))
+    events = []
+    hook = lambda event, data: events.append((event, data))
+    instrumentation.add_hook(hook)
+    try:
+        stats = f.factor()
+    finally:
+        instrumentation.remove_hook(hook)
+
+    counters = stats.counters
+    assert counters["roots_found"] == 3
+    assert counters["synthetic_divisions"] == counters["roots_found"] # candidates are tested without dividing
+    assert counters["candidates_tested"] + counters["candidates_skipped"] <= counters["candidates_generated"]
+    assert stats.timers["factor"] >= stats.timers["candidates"] + stats.timers["deflation"] + stats.timers["quadratic"]
+
+    tested = [data for event, data in events if event == "candidate"]
+    assert len(tested) == counters["candidates_tested"]
+    assert sum(data["is_root"] for data in tested) == 3
+    assert ("stage", "factor") in [(event, data.get("stage")) for event, data in events]
+
+def test_arithmetic():
+    f = Polynomial(1, -3, 2)
+    g = Polynomial(2, 0, 0, 5)
+    assert f + g == Polynomial(2, 1, -3, 7)
+    assert f - f == 0 and str(f - f) == "0"
+    assert 1 - f == Polynomial(-1, 3, -1)
+    assert f * g == Polynomial(2, -6, 4, 5, -15, 10)
+    assert f * Fraction(1, 2) == Polynomial(Fraction(1, 2), Fraction(-3, 2), 1)
+    assert f ** 3 == f * f * f and f ** 0 == 1
+    assert Polynomial(0, 0, 1, 2) == Polynomial(1, 2)
+
+def test_divmod():
+    f = Polynomial(2, -6, 4, 5, -15, 10)
+    assert divmod(f, Polynomial(1, -3, 2)) == (Polynomial(2, 0, 0, 5), 0)
+    q, r = divmod(f, Polynomial(1, -2)) # synthetic division
+    assert r == 0 and q * Polynomial(1, -2) == f
+    q, r = divmod(Polynomial(1, 0, 1), Polynomial(2, 1))
+    assert q * Polynomial(2, 1) + r == Polynomial(1, 0, 1) and r.degree == 0
+    a = Polynomial(*[Fraction((-1)**i * (i + 1), i % 7 + 1) for i in range(41)])
+    b = Polynomial(*[Fraction(i % 5 - 2, i % 3 + 1) for i in range(1, 22)]) # leading coefficient -1/2
+    q, r = divmod(a, b)
+    assert q * b + r == a and r.degree < b.degree
+
+def test_compose_and_derivative():
+    f = Polynomial(1, 0, -2)
+    assert f.compose(Polynomial(1, 1)) == Polynomial(1, 2, -1)
+    assert f.compose(3) == 7
+    assert Polynomial(3, 2, 1, 5).derivative() == Polynomial(9, 4, 1)
+
+def test_from_factors():
+    f = Polynomial(*expand((1, -3), (2, 1), (1, 4), (1, 0), (1, 1)))
+    f.factor()
+    assert Polynomial.from_factors(*f.factor_sets[0]) == f
+    g = Polynomial(1, -3, 5, -15, 4, -12) # (x - 3)(x^2 + 1)(x^2 + 4), complex conjugate pairs multiply out
+    g.factor()
+    assert len(g.factor_sets[0]) == 3
+    assert Polynomial.from_factors(g.factor_sets[0]) == g
+
+def test_large_products():
+    f = Polynomial(*[Fraction((-1)**i * (i + 1), i % 7 + 1) for i in range(1001)])
+    g = Polynomial(*[i % 13 - 6 for i in range(1001)])
+    product = f * g
+    assert product.degree == 2000
+    x = Fraction(3, 5)
+    assert product.evaluate(x) == f.evaluate(x) * g.evaluate(x)
+    f, g = Polynomial(*f.coefficients[:101]), Polynomial(*g.coefficients[:101])
+    assert divmod(f * g, g) == (f, 0)
+
+def test_factor_repeated_roots():
+    g = Polynomial(1, 0, 4) # x^2 + 4
+    f = Polynomial(*expand((1, -1), (1, -1), (1, -1), (1, -1), (1, -1), (3, 2), (3, 2), (1, 7))) * g
+    stats = f.factor()
+    assert stats.counters["squarefree_parts"] == 3
+    assert stats.counters["roots_found"] == 1 # only x + 7 needs the search, x - 1 and 3x + 2 are parts on their own
+    assert Polynomial.from_factors(f.factor_sets[0]) == f
+
+    multiplicities = sorted((str(factor), m) for factor, m in f.multiplicity_sets[0])
+    assert ("(x - 1)", 5) in multiplicities
+    assert ("(3x + 2)", 2) in multiplicities
+    assert len(f.factor_sets[0]) == 5 + 2 + 1 + 1
+
+def test_factor_repeated_with_content():
+    f = Polynomial(*expand((1, -2), (1, -2), (1, 3), (1, 3))) * 6
+    f.factor()
+    assert Polynomial.from_factors(f.factor_sets[0]) == f
+    assert f.factor_sets[0][0] == 6
+
+def test_real_root_intervals():
+    f = Polynomial(1, 0, -7, 0, 12, 0) # x(x^2 - 3)(x^2 - 4)
+    intervals = f.real_root_intervals(Fraction(1, 100))
+    assert len(intervals) == 5
+    assert all(low < r <= high or low == r == high for r, (low, high) in zip([-2, -3**0.5, 0, 3**0.5, 2], intervals))
+    assert f.view_xrange() == (-3, 3)
+    [(low, high)] = Polynomial(1, 0, 0, 1).real_root_intervals() # x^3 + 1
+    assert low < -1 <= high or low == high == -1
+
+def test_factor_prunes_candidates():
+    # 360 has 24 divisors, but only candidates near the three real roots are formed
+    f = Polynomial(*expand((1, -3), (1, 4), (2, -5))) * Polynomial(1, 0, 3)
+    stats = f.factor()
+    assert stats.counters["roots_found"] == 3
+    assert stats.counters["candidates_generated"] <= 3 * 2 * 2
+    assert Polynomial(1, 0, 0, 0, 1).factor().counters["candidates_generated"] == 0 # no real roots at all
+
+def test_integer_form():
+    f = Polynomial(Fraction(-3, 4), Fraction(3, 2), 0, Fraction(9, 8))
+    assert f.content == Fraction(-3, 8) and f.primitive == [2, -4, 0, -3]
+    assert f.coefficients == [Fraction(-3, 4), Fraction(3, 2), 0, Fraction(9, 8)]
+    assert Polynomial(0, 0).primitive == [0, 0]
+
+    for x in (Fraction(2, 3), Fraction(-5, 7), 4):
+        x = Fraction(x)
+        assert integer_horner(f.primitive, x.numerator, x.denominator) == x.denominator**3 * f.evaluate(x) / f.content
@@ -11,3 +11,46 @@ def test_find_roots():
     assert Trinomial(1, 4, -32).roots == [4, -8]
     assert Trinomial(12, 5, -2).roots == [Fraction(1,4), Fraction(-2,3)]
 
+
+def test_exact_radicals():
+    f = Trinomial(1, 1, -1)
+    assert not isinstance(f.radical, Fraction) and f.radical**2 == 5
+    r1, r2 = f.roots
+    assert r1 + r2 == -1 and r1 * r2 == -1
+    assert f.evaluate(r1) == 0
+
+    g = Trinomial(3, 7, 1)
+    pair = g.factor(2)
+    expanded = pair.expand()
+    assert (expanded.a, expanded.b, expanded.c) == (3, 7, 1)
+
+def test_rational_radicals():
+    assert Trinomial(4, -17, -50).radical == 33
+    assert Trinomial(9, 0, -4).roots == [Fraction(2,3), Fraction(-2,3)]
+    assert Trinomial(Fraction(1,4), 1, 1).roots == [-2]
+
+def test_factor_range():
+    f = Trinomial(3, 7, 1)
+    family = f.factor_range(-2, 2, Fraction(1,2))
+    assert len(family) == 7 # p = 0 is skipped
+    for pair, p in zip(family, [-2, Fraction(-3,2), -1, Fraction(-1,2), Fraction(1,2), 1, Fraction(3,2)]):
+        expected = f.factor(p)
+        assert (pair.p, pair.q, pair.r, pair.s) == (expected.p, expected.q, expected.r, expected.s)
+    assert family[-1].p == Fraction(3,2)
+
+    x = [-1.0, 0.0, 2.5]
+    lines = family.evaluate(x)
+    assert lines.shape == (7, 2, 3)
+    assert abs(lines[2, 0, 2] - float(family[2].binomials[0].evaluate(Fraction(5,2)))) < 1e-12
+    assert abs((lines[:, 0] * lines[:, 1] - [float(f.evaluate(Fraction(v))) for v in x]).max()) < 1e-9
+
+def test_factor_range_large():
+    family = Trinomial(1, 1, -6).factor_range(-50000, 50000)
+    assert len(family) == 99999
+    assert family.evaluate([0.0, 1.0]).shape == (99999, 2, 2)
+    assert family[0].binomials[0].a == -50000
+
+def test_view_xrange():
+    assert Trinomial(1, -1, -6).view_xrange() == (Fraction(-13, 4), Fraction(17, 4)) # roots -2 and 3, padded by a quarter
+    assert Trinomial(1, 0, 1).view_xrange() == (-1, 1) # only the vertex
+    assert Trinomial(0, 2, 4).view_xrange() == (-3, -1) # linear, no vertex
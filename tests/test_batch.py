@@ -0,0 +1,51 @@
+import io
+import json
+from mathvis import batch
+from mathvis.polynomials import precision
+
+lines = ["1 4 -32", "# comment", "", "1, -3, 3, -9, 2, -6", "1 2", "12 5 -2"] * 5
+
+def results(**kwargs):
+    output = io.StringIO()
+    written = batch.run(iter(lines), output, **kwargs)
+    parsed = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert written == len(parsed) == 20
+    return parsed
+
+def test_parse_line():
+    assert batch.parse_line(" 1, -2 3\n") == ["1", "-2", "3"]
+    assert batch.parse_line("# 1 2 3") is None
+    assert batch.parse_line("   ") is None
+
+def test_analyze():
+    assert batch.analyze(["1", "4", "-32"])["roots"] == ["4", "-8"]
+    assert batch.analyze(["1", "-3", "3", "-9", "2", "-6"])["factors"][0] == "(x - 3)"
+    assert "error" in batch.analyze(["1", "2"])
+    assert "error" in batch.analyze(["1", "x", "2"])
+
+def test_run_inline():
+    parsed = results(jobs=1, chunk_size=3)
+    assert [r["line"] for r in parsed][:4] == [1, 4, 5, 6]
+
+def test_run_pool():
+    ordered = results(jobs=2, chunk_size=2)
+    assert ordered == results(jobs=1)
+    unordered = results(jobs=2, chunk_size=2, ordered=False)
+    assert sorted(unordered, key=lambda r: r["line"]) == ordered
+
+def test_profile():
+    profiled = results(jobs=1, profile=True)
+    assert all("stats" in r for r in profiled if "error" not in r)
+    assert profiled[1]["stats"]["counters"]["roots_found"] == 1
+
+def test_cache_keeps_policies_apart(tmp_path):
+    coefficients = ["0.123", "3.14159", "1", "2"]
+    batch.curvecache.configure(str(tmp_path / "cache.sqlite"))
+    try:
+        with precision.policy("bounded", 10):
+            bounded = batch.analyze(coefficients)
+        exact = batch.analyze(coefficients)
+    finally:
+        batch.curvecache.configure()
+    assert bounded["polynomial"] == "1/10x^3 + 31/10x^2 + x + 2"
+    assert exact == batch._analyze(coefficients)
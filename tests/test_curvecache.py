@@ -0,0 +1,49 @@
+from mathvis.curvecache import CurveCache, key
+import numpy
+
+def test_key_normalization():
+    assert key("curve", ["1", "1.0", 2]) == key("curve", [1, 1, "2/1"])
+    assert key("curve", [1, 2], -10, 10) != key("curve", [1, 2], -10, 20)
+
+def test_lru_eviction():
+    cache = CurveCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (3, 1, 2)
+
+def test_byte_bound():
+    cache = CurveCache(maxbytes=12000)
+    cache.put("a", numpy.zeros(1000))
+    cache.put("b", numpy.zeros(1000))
+    assert cache.get("a") is None and cache.get("b") is not None
+    assert cache.cache_info().currbytes <= 12000
+    cache.put("huge", numpy.zeros(10000))
+    assert cache.get("huge") is None and cache.get("b") is not None
+
+def test_get_or_compute():
+    cache = CurveCache()
+    calls = []
+    def compute(x):
+        calls.append(x)
+        return x * 2
+    assert cache.get_or_compute("k", compute, 21) == 42
+    assert cache.get_or_compute("k", compute, 21) == 42
+    assert calls == [21]
+
+def test_persistence(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = CurveCache(path=path)
+    cache.put(key("curve", [1, 0, -2], -10, 10), (numpy.arange(3.0), "x^2 - 2"))
+    cache.close()
+
+    warm = CurveCache(path=path)
+    x, title = warm.get(key("curve", ["1", "0", "-2"], -10, 10))
+    assert list(x) == [0, 1, 2] and title == "x^2 - 2"
+    assert warm.cache_info().disk_hits == 1
+    warm.clear(disk=True)
+    assert warm.get(key("curve", [1, 0, -2], -10, 10)) is None
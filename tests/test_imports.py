@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+
+MATHVIS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mathvis")
+
+def loaded_after_import(module):
+    code = "import sys, {}; print(' '.join(sorted(sys.modules)))".format(module)
+    process = subprocess.run([sys.executable, "-c", code], env=dict(os.environ, PYTHONPATH=MATHVIS),
+                             capture_output=True, text=True, check=True)
+    return set(process.stdout.split())
+
+def test_polynomials_import_is_lazy():
+    loaded = loaded_after_import("polynomials")
+    assert "numpy" not in loaded and "matplotlib" not in loaded
+
+def test_cfractions_has_no_dependencies():
+    loaded = loaded_after_import("cfractions")
+    assert "numpy" not in loaded and "polynomials" not in loaded
@@ -0,0 +1,42 @@
+from fractions import Fraction
+from mathvis import polyarith
+from mathvis.isolation import cauchy_bound, lagrange_bound, root_bound, descartes_bounds, sturm_sequence, sturm_count, \
+    real_root_intervals, refine, view_range
+
+def from_roots(*roots):
+    coefficients = [1]
+    for r in roots:
+        coefficients = polyarith.mul(coefficients, [r.denominator, -r.numerator])
+    return coefficients
+
+def test_bounds():
+    f = from_roots(Fraction(-7), Fraction(2), Fraction(1, 3))
+    assert all(abs(r) <= bound(f) for r in (7, 2) for bound in (cauchy_bound, lagrange_bound, root_bound))
+    assert lagrange_bound([1, 0, 0, 0, -16]) == 2 # x^4 - 16, exact when the roots are powers of two
+    assert root_bound(from_roots(Fraction(10**6), Fraction(-10**6 + 1))) < 2**21
+    assert descartes_bounds(f) == (2, 1)
+    assert descartes_bounds([1, 0, 1]) == (0, 0)
+
+def test_sturm_count():
+    sequence = sturm_sequence(polyarith.mul(from_roots(Fraction(-1), Fraction(1, 2), Fraction(3)), [1, 0, -2]))
+    assert sturm_count(sequence, Fraction(-10), Fraction(10)) == 5
+    assert sturm_count(sequence, Fraction(0), Fraction(1, 2)) == 1 # (low, high]
+    assert sturm_count(sequence, Fraction(1, 2), Fraction(1)) == 0
+
+def test_real_root_intervals():
+    roots = [Fraction(-5, 3), Fraction(0), Fraction(1, 7), Fraction(1, 6), Fraction(40)]
+    f = polyarith.mul(from_roots(*roots, roots[1]), [1, 0, 1]) # 0 twice, and two complex roots
+    intervals = real_root_intervals(f)
+    assert len(intervals) == len(roots)
+    for r, (low, high) in zip(roots, intervals):
+        assert low < r <= high or low == r == high
+    assert real_root_intervals([1, 0, 1]) == [] and real_root_intervals([3, 2]) == [(Fraction(-2, 3),) * 2]
+
+    g = polyarith.mul(from_roots(Fraction(4)), [1, 0, -2])
+    low, high = refine(g, real_root_intervals(g)[-1], Fraction(1, 10**6))
+    assert high - low <= Fraction(1, 10**6) and low < 4 <= high or low == high == 4
+    assert all(high - low <= Fraction(1, 8) for low, high in real_root_intervals(g, Fraction(1, 8)))
+
+def test_view_range():
+    assert view_range([]) == (-10, 10)
+    assert view_range([(Fraction(-2), Fraction(-1)), (Fraction(3), Fraction(3))]) == (Fraction(-13, 4), Fraction(17, 4))
@@ -0,0 +1,46 @@
+import math
+from fractions import Fraction
+from mathvis.polynomials import Polynomial, synthetic_division, horner, precision, CFraction
+
+coefficients = [Fraction(i + 1, i + 2) * (-1)**i for i in range(21)]
+
+def test_exact_by_default():
+    x = Fraction(math.sqrt(2))
+    assert precision.current().mode == "exact"
+    assert horner(coefficients, x) == sum(c * x**(20 - i) for i, c in enumerate(coefficients))
+
+def test_bounded():
+    root = CFraction(Fraction(1, 3), math.sqrt(2))
+    exact = synthetic_division(coefficients, root)[0]
+    with precision.policy("bounded", 1000) as policy:
+        assert CFraction(0, math.sqrt(2)).imag == Fraction(1414, 1000)
+        remainder, quotient = synthetic_division(coefficients, root)
+        assert all(c.imag.denominator <= 1000 and c.real.denominator <= 1000 for c in quotient + [remainder])
+        assert abs(CFraction(1, 1)).denominator <= 1000
+    assert precision.current().mode == "exact"
+    assert policy.truncations > 0 and 0 < policy.max_error <= math.sqrt(2) / 2000
+    assert abs(complex(remainder) - complex(exact)) < 1e-3 * abs(complex(exact))
+    assert CFraction(0, math.sqrt(2)).imag.denominator > 1000
+
+def test_float_fallback():
+    root = Fraction(math.sqrt(2))
+    exact = synthetic_division(coefficients, root)[0]
+    with precision.policy("float", 10**9) as policy:
+        remainder, quotient = synthetic_division(coefficients, root)
+        assert horner(list(range(21)), Fraction(1, 2)) == sum(k * Fraction(1, 2)**(20 - k) for k in range(21)) # 2**20 is within the bound
+    assert type(remainder) is float and len(quotient) == 20
+    assert math.isclose(remainder, exact, rel_tol=1e-12)
+    assert policy.fallbacks == 1 and policy.truncations == 0
+
+def test_configure():
+    try:
+        precision.configure("bounded", 100)
+        assert Polynomial(0.1, math.pi, 1).coefficients == [Fraction(1, 10), Fraction(157, 50), 1]
+        assert precision.current().truncations == 2 # 0.1 is not exactly 1/10 as a float
+    finally:
+        precision.configure()
+    try:
+        precision.policy("approximate").__enter__()
+        assert False
+    except ValueError:
+        assert True
@@ -0,0 +1,44 @@
+from mathvis import primes
+from mathvis.primes import factorize, is_prime, sieve
+from mathvis.polynomials import prime_factor
+from functools import reduce
+from operator import mul
+
+def test_sieve():
+    assert sieve(30) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    assert sieve(1) == []
+
+def test_is_prime():
+    assert [n for n in range(50) if is_prime(n)] == sieve(50)
+    assert is_prime(2**61 - 1)
+    assert not is_prime(561) # Carmichael number
+    assert not is_prime((2**31 - 1) * (2**61 - 1))
+
+def test_factorize():
+    assert factorize(0) == {} and factorize(1) == {} and factorize(-1) == {}
+    assert factorize(-360) == {2: 3, 3: 2, 5: 1}
+    assert factorize(1000003**2) == {1000003: 2}
+    n = 600851475143 * 1000000007 * 999999937
+    assert factorize(n) == {71: 1, 839: 1, 1471: 1, 6857: 1, 999999937: 1, 1000000007: 1}
+    assert reduce(mul, prime_factor(n)) == n
+
+def test_factorize_cache():
+    primes.cache_clear()
+    primes.set_cache_size(2)
+    try:
+        factorize(12)
+        factorize(-12)
+        factorize(35)
+        factorize(99)
+        info = primes.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 3, 2)
+        result = factorize(12)
+        result[2] = 0
+        assert factorize(12) == {2: 2, 3: 1}
+    finally:
+        primes.set_cache_size(1024)
+        primes.cache_clear()
+
+def test_prime_factor():
+    assert prime_factor(-360) == [2, 2, 2, 3, 3, 5]
+    assert prime_factor(0) == []
@@ -0,0 +1,52 @@
+import numpy
+from fractions import Fraction
+from mathvis.cfractions import CFraction
+from mathvis.polynomials import format_cfraction
+from mathvis.rootsolver import roots, to_cfractions
+
+def matches(found, expected, tolerance=1e-9):
+    distances = numpy.abs(numpy.asarray(found)[:, None] - numpy.asarray(expected)[None, :])
+    return distances.min(axis=0).max() < tolerance and distances.min(axis=1).max() < tolerance
+
+def test_known_roots():
+    coefficients = [numpy.poly([1, 2, 3, 4]), numpy.poly([-1j, 1j, 5, -0.5]), numpy.poly([2, 2, 3, 7]) * 3]
+    result = roots(coefficients)
+    assert result.dtype == numpy.complex128 and result.shape == (3, 4)
+    assert matches(result[0], [1, 2, 3, 4])
+    assert matches(result[1], [-1j, 1j, 5, -0.5])
+    assert matches(result[2], [2, 2, 3, 7], 1e-6) # a double root converges slower
+
+def test_batch_matches_numpy():
+    coefficients = numpy.random.default_rng(1).normal(size=(500, 7))
+    for method in ("aberth", "durand-kerner"):
+        result, converged, iterations = roots(coefficients, method=method, max_iterations=200, full_output=True)
+        assert converged.all() and iterations.max() < 200
+        assert all(matches(r, numpy.roots(c), 1e-7) for r, c in zip(result, coefficients))
+
+def test_convergence_mask():
+    coefficients = [[1, -3, 2], [1, 0, -1]]
+    result, converged, iterations = roots(coefficients, max_iterations=1, full_output=True)
+    assert result.shape == (2, 2) and not converged.all() and (iterations == 1).all()
+    _, converged, iterations = roots([[1, -3, 2], [1, -300, 20000]], full_output=True)
+    assert converged.all() and iterations[0] != iterations[1] # rows stop iterating on their own
+
+def test_degenerate_input():
+    assert roots([[2, -1], [4, 2]]).tolist() == [[0.5], [-0.5]]
+    assert roots([[3], [1]]).shape == (2, 0)
+    try:
+        roots([[0, 1, 2]])
+        assert False
+    except ValueError:
+        assert True
+    try:
+        roots([1, 2, 3])
+        assert False
+    except ValueError:
+        assert True
+
+def test_cfraction_round_trip():
+    result = roots([[4, -4, 5]]) # (1/2 +- j)
+    values = to_cfractions(result)
+    assert sorted(values[0], key=lambda c: c.imag) == [CFraction(Fraction(1, 2), -1), CFraction(Fraction(1, 2), 1)]
+    assert format_cfraction(values[0][0]) in ("(1/2 + 1j)", "(1/2 - 1j)")
+    assert to_cfractions(numpy.complex128(0.25 + 0.1j), max_denominator=10) == CFraction(Fraction(1, 4), Fraction(1, 10))
@@ -0,0 +1,38 @@
+from mathvis.polynomials import Polynomial, Quadratic
+from mathvis.sampling import adaptive_sample
+from fractions import Fraction
+import numpy
+
+def test_includes_ends_and_roots():
+    f = Quadratic(3, -1, -1)
+    x, y = adaptive_sample(f.evaluate, Fraction(-5, 2), 4, f.roots)
+    assert x[0] == -2.5 and x[-1] == 4
+    assert numpy.all(numpy.diff(x) > 0)
+    for root in f.roots:
+        assert float(root) in x
+    assert numpy.allclose(y, f.evaluate(x))
+
+def test_refines_where_curved():
+    f = Polynomial(1, 0, -10, 0, 1)
+    x, y = adaptive_sample(f.evaluate, -4, 4, pixel_width=400)
+    curved = numpy.count_nonzero(numpy.abs(x) < 3.5)
+    assert curved > 3 * numpy.count_nonzero(numpy.abs(x) >= 3.5)
+    # linear interpolation between the samples stays close to the curve
+    fine = numpy.linspace(-4, 4, 4001)
+    assert numpy.max(numpy.abs(numpy.interp(fine, x, y) - f.evaluate(fine))) < 0.01 * numpy.ptp(y)
+
+def test_lines_need_few_points():
+    f = Quadratic(0, 2, 1)
+    x, y = adaptive_sample(f.evaluate, -1000, 1000, f.roots)
+    assert len(x) == 34
+    # without the root, the sign change is narrowed down to a pixel
+    x, y = adaptive_sample(f.evaluate, -1000, 1000, pixel_width=800)
+    crossing = numpy.flatnonzero(y[:-1] * y[1:] < 0)[0]
+    assert x[crossing + 1] - x[crossing] <= 2 * 2000 / 800
+
+def test_point_cap():
+    f = Polynomial(1, 0, -10, 0, 1)
+    x, y = adaptive_sample(f.evaluate, -10000, 10000, pixel_width=200)
+    assert len(x) <= 201
+    x, y = adaptive_sample(f.evaluate, -4, 4, tolerance=1e-9, max_points=50)
+    assert len(x) == 50
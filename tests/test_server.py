@@ -0,0 +1,75 @@
+import asyncio
+import json
+import os
+import tempfile
+from mathvis import server
+
+def respond(lines, **kwargs):
+    async def run():
+        async with server.Server(**kwargs) as s:
+            responses = await asyncio.gather(*(s.respond(line) for line in lines))
+            return [json.loads(r) for r in responses], s.stats()
+    return asyncio.run(run())
+
+def test_operations():
+    responses, stats = respond([
+        '{"id": 1, "op": "factor", "coefficients": [1, -3, 2]}',
+        '{"id": 2, "op": "roots", "coefficients": [[1, 0, -4], [1, 0, 1]]}',
+        '{"id": 3, "op": "evaluate", "coefficients": "1 0 -2", "low": -2, "high": 2, "points": 5}',
+        '{"id": 4, "op": "factor_range", "coefficients": ["1", "4", "-32"], "start": 1, "stop": 3}',
+    ], jobs=0)
+    assert [r["id"] for r in responses] == [1, 2, 3, 4]
+    assert responses[0]["result"]["factors"] == ["(x - 2)", "(x - 1)"]
+    assert sorted(r for r, _ in responses[1]["result"][0]["roots"]) == [-2.0, 2.0]
+    assert responses[1]["result"][1]["converged"]
+    assert responses[2]["result"] == {"x": [-2.0, -1.0, 0.0, 1.0, 2.0], "y": [2.0, -1.0, -2.0, -1.0, 2.0]}
+    assert responses[3]["result"]["factors"] == [["(x - 4)", "(x + 8)"], ["(2x - 8)", "(1/2x + 4)"]]
+    assert stats["requests"] == 4 and stats["errors"] == 0 and stats["latency_ms"]["count"] == 4
+
+def test_factor_keeps_content():
+    responses, _ = respond(['{"id": 1, "op": "factor", "coefficients": [2, 0, 0, 6]}',
+                            '{"id": 2, "op": "factor", "coefficients": [2, -2, 0, 6, -6]}'], jobs=0)
+    assert responses[0]["result"]["factors"] == ["2x^3 + 6"]
+    assert responses[1]["result"]["factors"] == ["(x - 1)", "2x^3 + 6"] # 2 (x - 1)(x^3 + 3)
+
+def test_errors():
+    responses, stats = respond(['not json', '{"id": 2, "op": "divide"}', '{"id": 3, "op": "roots", "coefficients": [[1, 2], [1, 2, 3]]}',
+                                '{"id": 4, "op": "factor_range", "coefficients": [1, 2, 3, 4]}'], jobs=0)
+    assert responses[0]["id"] is None and responses[0]["error"].startswith("JSONDecodeError")
+    assert all("error" in r for r in responses)
+    assert stats["errors"] == 4 and stats["operations"]["unknown"] == 1
+
+def test_unix_socket():
+    path = os.path.join(tempfile.mkdtemp(), "mathvis.sock")
+    async def run():
+        async with server.Server(jobs=2, max_pending=2) as s:
+            ready = asyncio.Event()
+            serving = asyncio.create_task(s.serve_unix(path, ready.set))
+            await ready.wait()
+            async with server.Client(path) as client:
+                requests = [client.request("factor", coefficients=[1, -k * k]) for k in range(1, 4)]
+                requests += [client.request("factor", coefficients=[1, 0, -k * k]) for k in range(1, 6)]
+                responses = await asyncio.gather(*requests)
+                stats = (await client.request("stats"))["result"]
+            serving.cancel()
+            return responses, stats
+    responses, stats = asyncio.run(run())
+    assert all("error" in r["result"] for r in responses[:3]) # fewer than 3 terms
+    assert [r["result"]["roots"] for r in responses[3:]] == [[str(k), str(-k)] for k in range(1, 6)]
+    assert stats["requests"] == 9 and stats["max_pending"] == 2 and stats["peak_queued"] >= 1
+    assert not os.path.exists(path)
+
+def test_unix_socket_keeps_other_files():
+    path = os.path.join(tempfile.mkdtemp(), "notes.txt")
+    with open(path, "w") as f:
+        f.write("keep me")
+    async def run():
+        async with server.Server(jobs=0) as s:
+            await s.serve_unix(path)
+    try:
+        asyncio.run(run())
+        assert False
+    except FileExistsError:
+        assert True
+    with open(path) as f:
+        assert f.read() == "keep me"
@@ -0,0 +1,51 @@
+import math
+import time
+from fractions import Fraction
+from mathvis.surds import Surd, sqrt, surd
+from mathvis.polynomials import Polynomial, Quadratic
+
+def test_sqrt():
+    assert sqrt(Fraction(9, 4)) == Fraction(3, 2)
+    assert type(sqrt(16)) is Fraction
+    root = sqrt(Fraction(12, 5)) # 2*sqrt(15)/5
+    assert (root.rational, root.coefficient, root.radicand) == (0, Fraction(2, 5), 15)
+    assert root**2 == Fraction(12, 5)
+
+def test_arithmetic():
+    x = Surd(1, 1, 2)
+    assert x * x.conjugate_surd() == -1
+    assert type(x * x.conjugate_surd()) is Fraction
+    assert x + x == Surd(2, 2, 2)
+    assert (x - 1)**2 == 2
+    assert 1 / x == x - 2
+    assert x**-2 * x**2 == 1
+    assert x * 0.5 == float(x) / 2
+
+def test_comparison():
+    assert Surd(3, -2, 2) > 0 # 3 > 2*sqrt(2)
+    assert Surd(-3, 2, 2) < 0
+    assert Surd(1, 1, 2) > Surd(1, Fraction(99, 100), 2)
+    assert math.floor(Surd(0, 1, 10**6 + 3)) == math.isqrt(10**6 + 3)
+    assert abs(Surd(1, -1, 2)) == Surd(-1, 1, 2)
+    assert surd(5, 0, 7) == 5 and type(surd(5, 0, 7)) is Fraction
+
+def test_str():
+    assert str(Surd(Fraction(-1, 2), Fraction(1, 2), 5)) == "(-1 + √5)/2"
+    assert str(Surd(0, -3, 2)) == "-3√2"
+    assert str(Surd(2, -1, 3)) == "(2 - √3)"
+
+def test_large_radicand():
+    # a ~29 digit semiprime discriminant is never factored, only small square factors come out
+    n = 1000000007 * 1000000009
+    start = time.perf_counter()
+    root = sqrt(4 * 1009**2 * n)
+    assert time.perf_counter() - start < 0.1
+    assert (root.coefficient, root.radicand) == (2, 1009**2 * n) # 1009 is above square_factor_bound
+    assert root == Surd(0, 2 * 1009, n) and hash(root) == hash(Surd(0, 2 * 1009, n))
+    assert root / Surd(0, 1, n) == 2 * 1009 and root - Surd(0, 2018, n) == 0
+
+    start = time.perf_counter()
+    assert len(Quadratic(1, 1, -7500000000955300000003164334).roots) == 2
+    f = Polynomial(1, -1, n * 10**11, -n * 10**11) # (x - 1)(x^2 + N), the leftover quadratic has a large discriminant
+    f.factor()
+    assert time.perf_counter() - start < 0.1
@@ -0,0 +1,36 @@
+import random
+from mathvis import polyarith, zassenhaus
+
+def product(polynomials):
+    result = [1]
+    for p in polynomials:
+        result = polyarith.mul(result, p)
+    return result
+
+def test_factor_mod_p():
+    factors = zassenhaus.factor_mod_p([1, 0, 0, 0, -1], 13) # x^4 - 1 splits completely since 4 | 12
+    assert sorted(factors) == [[1, 1], [1, 5], [1, 8], [1, 12]]
+    assert zassenhaus.factor_mod_p([1, 0, 1], 7) == [[1, 0, 1]]
+
+def test_hensel_lift():
+    f = [1, 0, -2] # x^2 - 2 = (x - 3)(x + 3) mod 7
+    lifted = zassenhaus.hensel_lift(f, zassenhaus.factor_mod_p(f, 7), 7, 4)
+    g = product(lifted)
+    assert [c % 7**4 for c in g] == [1, 0, -2 % 7**4]
+
+def test_factor():
+    assert zassenhaus.factor(product([[1, 0, 1], [1, 0, 2]])) == (1, [([1, 0, 1], 1), ([1, 0, 2], 1)])
+    assert zassenhaus.factor([1, 0, -10, 0, 1]) == (1, [([1, 0, -10, 0, 1], 1)])
+    assert zassenhaus.factor([-6, 0, -6]) == (-6, [([1, 0, 1], 1)])
+    assert zassenhaus.factor(product([[2, 1], [2, 1], [1, 0, 1]])) == (1, [([2, 1], 2), ([1, 0, 1], 1)])
+    cyclotomic = zassenhaus.factor([1] + [0] * 11 + [-1])[1]
+    assert sorted(len(f) - 1 for f, _ in cyclotomic) == [1, 1, 2, 2, 2, 4]
+
+def test_factor_random_products():
+    random.seed(7)
+    for _ in range(5):
+        factors = [[random.randint(1, 5)] + [random.randint(-9, 9) for _ in range(random.randint(1, 8))] for _ in range(5)]
+        f = product(factors)
+        c, result = zassenhaus.factor(f)
+        assert product([[c]] + [g for g, m in result for _ in range(m)]) == f
+        assert len(f) - 1 >= 10